@@ -1,5 +1,6 @@
 from .geometric_bridge import (
     predict_rotation_curve,
+    predict_rotation_curve_batch,
     g_obs_from_g_bar,
     v_bar_from_components,
     boost,
@@ -7,11 +8,13 @@ from .geometric_bridge import (
     baryonic_mass_from_btfr,
     rms_residual,
     r_squared,
+    fit_metrics,
     A0,
 )
 
 __all__ = [
     'predict_rotation_curve',
+    'predict_rotation_curve_batch',
     'g_obs_from_g_bar',
     'v_bar_from_components',
     'boost',
@@ -19,5 +22,6 @@ __all__ = [
     'baryonic_mass_from_btfr',
     'rms_residual',
     'r_squared',
+    'fit_metrics',
     'A0',
 ]
@@ -12,29 +12,123 @@ Usage
 -----
     python -m src.benchmark data/MassModels_Lelli2016c.txt
     python -m src.benchmark data/MassModels_Lelli2016c.txt --output results/
+    python -m src.benchmark data/MassModels_Lelli2016c.txt --jobs 1
+    python -m src.benchmark data/MassModels_Lelli2016c.txt --minimal
 """
 
 import argparse
+
 import numpy as np
 import pandas as pd
 from pathlib import Path
+from numba import njit, get_num_threads, set_num_threads
+
+from .sparc_loader import load_sparc, galaxy_arrays, galaxy_list
+from .geometric_bridge import A0, halo_boundary_radius, _v_pred_point
+from .fitting import fit_ml_batch
+
+
+@njit(fastmath=True, cache=True)
+def _v_newton_point(vg, vd, vb, ml):
+    """Newtonian baryonic velocity at one radius (gas clipped at zero)."""
+    vgp = max(vg, 0.0)
+    return np.sqrt(vgp * vgp + ml * vd * vd + ml * vb * vb)
+
+
+@njit(fastmath=True, cache=True)
+def _v_rar_point(vg, vd, vb, r, ml, a0_inv):
+    """McGaugh+2016 RAR velocity at one radius; takes 1/a0 from the caller."""
+    vgp = max(vg, 0.0)
+    gb = (vgp * vgp + ml * vd * vd + ml * vb * vb) / max(r, 1e-6)
+    x = max(gb * a0_inv, 1e-12)
+    # Evaluated directly: x spans ~16 decades, so a lookup table would need
+    # its own log10/power per point and cost more than this exp + sqrt.
+    g_obs = gb / (1.0 - np.exp(-np.sqrt(x)))
+    return np.sqrt(max(g_obs * r, 0.0))
+
 
-from .sparc_loader import load_sparc, get_galaxy, galaxy_list
-from .geometric_bridge import (predict_rotation_curve, rms_residual, r_squared,
-                                A0, halo_boundary_radius)
-from .fitting import fit_ml
+# Columns carried into the flat per-galaxy layout used by the kernels below.
+SOA_COLUMNS = ('r', 'V_obs', 'eV', 'V_gas', 'V_disk', 'V_bul')
 
 
-def _f_rar(v_gas, v_disk, v_bul, r, ml=0.5):
-    """McGaugh+2016 RAR for comparison."""
-    v_bar = np.sqrt(np.maximum(v_gas, 0)**2 + ml*v_disk**2 + ml*v_bul**2)
-    gb    = v_bar**2 / np.maximum(r, 1e-6)
-    x     = np.maximum(gb / A0, 1e-12)
-    g_obs = gb / (1 - np.exp(-np.sqrt(x)))
-    return np.sqrt(np.maximum(g_obs * r, 0))
+def _stack_galaxies(df, galaxies, min_points=3):
+    """
+    Concatenate the valid rotation curve of every galaxy into flat arrays.
+
+    Returns
+    -------
+    names : list of str
+        Galaxies with at least `min_points` valid points, in input order.
+    T : ndarray of int
+        Hubble type per galaxy.
+    cols : dict of ndarray
+        One contiguous float64 array per column in SOA_COLUMNS.
+    starts, lengths : ndarray of int32
+        Galaxy g occupies cols[...][starts[g]:starts[g] + lengths[g]].
+    """
+    arrays = galaxy_arrays(df, SOA_COLUMNS)
+    index, offsets = arrays['index'], arrays['offsets']
+    gids = np.array([index[g] for g in galaxies if g in index], dtype=np.intp)
+    gids = gids[offsets[gids + 1] - offsets[gids] >= min_points]
+    names = [arrays['names'][g] for g in gids]
+    T = arrays['T'][gids]
+
+    lengths = (offsets[gids + 1] - offsets[gids]).astype(np.int32)
+    starts = np.zeros_like(lengths)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    if np.array_equal(gids, np.arange(len(arrays['names']))):
+        cols = {c: arrays[c] for c in SOA_COLUMNS}   # all galaxies, already in order
+    else:
+        rows = np.repeat(offsets[gids] - starts, lengths) + np.arange(lengths.sum())
+        cols = {c: arrays[c][rows] for c in SOA_COLUMNS}
+    return names, np.array(T, dtype=int), cols, starts, lengths
 
 
-def run_benchmark(sparc_path, output_dir=None, verbose=True):
+@njit(fastmath=True, nogil=True, cache=True)
+def _zero_param_metrics(r, vob, vg, vd, vb, starts, lengths, ml, a0, out, with_r2=True):
+    """
+    Fixed-M/L metrics for every galaxy in a single fused pass.
+
+    Writes out[g] = (rms_newton, rms_geom, r2_geom, rms_rar, r2_rar).
+    The mean and variance of V_obs are accumulated with Welford's update,
+    so no per-galaxy prediction arrays are materialised. With
+    with_r2=False that accumulation is skipped and both R^2 are NaN.
+    """
+    a0_inv = 1.0 / a0
+    for g in range(starts.shape[0]):
+        s = starts[g]
+        n = lengths[g]
+        mean = 0.0
+        ss_tot = 0.0
+        ss_newton = 0.0
+        ss_geom = 0.0
+        ss_rar = 0.0
+        for k in range(n):
+            i = s + k
+            v = vob[i]
+            if with_r2:
+                delta = v - mean
+                mean += delta / (k + 1)
+                ss_tot += delta * (v - mean)
+
+            d = v - _v_newton_point(vg[i], vd[i], vb[i], ml)
+            ss_newton += d * d
+
+            d = v - _v_rar_point(vg[i], vd[i], vb[i], r[i], ml, a0_inv)
+            ss_rar += d * d
+
+            d = v - _v_pred_point(r[i], vg[i], vd[i], vb[i], ml, ml, a0)
+            ss_geom += d * d
+
+        out[g, 0] = np.sqrt(ss_newton / n)
+        out[g, 1] = np.sqrt(ss_geom / n)
+        out[g, 2] = 1.0 - ss_geom / ss_tot if ss_tot > 0 else np.nan
+        out[g, 3] = np.sqrt(ss_rar / n)
+        out[g, 4] = 1.0 - ss_rar / ss_tot if ss_tot > 0 else np.nan
+
+
+def run_benchmark(sparc_path, output_dir=None, verbose=True, n_jobs=None,
+                  extra_metrics=True):
     """
     Run the full benchmark.
 
@@ -44,78 +138,68 @@ def run_benchmark(sparc_path, output_dir=None, verbose=True):
     output_dir : str or Path, optional
         If given, save CSV results there.
     verbose : bool
+    n_jobs : int, optional
+        Threads for the per-galaxy fits (at most Numba's thread count,
+        the default). Use 1 to fit serially in the calling thread.
+    extra_metrics : bool
+        Also compute R^2 for the fixed-M/L geometric and RAR predictions
+        (columns r2_geom_fixed, r2_rar). Not needed for the summary.
 
     Returns
     -------
     results : pd.DataFrame
-        Per-galaxy results including rms and R^2 for all formula variants.
+        Per-galaxy results: rms for all formula variants, plus R^2 for each
+        when extra_metrics is set (always for the fitted geometric curve).
     summary : dict
         Aggregate statistics.
     """
     df = load_sparc(sparc_path)
     galaxies = galaxy_list(df)
+    names, T, cols, starts, lengths = _stack_galaxies(df, galaxies)
+
+    # 1, 3, 4. Fixed M/L = 0.5: geometric, Newton (no DM) and RAR together
+    fixed = np.empty((len(names), 5))
+    _zero_param_metrics(cols['r'], cols['V_obs'], cols['V_gas'], cols['V_disk'],
+                        cols['V_bul'], starts, lengths, 0.5, A0, fixed,
+                        extra_metrics)
+
+    # 2. Fitted M/L: every galaxy in one compiled call, spread over threads
+    offsets = np.append(0, np.cumsum(lengths))
+    n_threads = get_num_threads()
+    if n_jobs:
+        set_num_threads(min(n_jobs, n_threads))
+    try:
+        fit = fit_ml_batch({**cols, 'offsets': offsets})
+    finally:
+        set_num_threads(n_threads)
+    rms_fit, r2_fit, chi2_fit = fit['rms'], fit['r2'], fit['chi2']
+    ml_disk, ml_bul = fit['ml_disk'], fit['ml_bul']
+
+    # Halo boundary: V_flat from the last three points of every galaxy at once
+    ends = starts + lengths
+    v_flat = cols['V_obs'][ends[:, None] - np.arange(3, 0, -1)].mean(axis=1)
+    r_halo = halo_boundary_radius(v_flat)
 
-    rows = []
-    for i, gname in enumerate(galaxies):
-        sub = get_galaxy(df, gname)
-        if len(sub) < 3:
-            continue
-
-        r   = sub['r'].values
-        vob = sub['V_obs'].values
-        ev  = sub['eV'].values
-        vg  = sub['V_gas'].values
-        vd  = sub['V_disk'].values
-        vb  = sub['V_bul'].values
-        T   = int(sub['T'].iloc[0])
-
-        # 1. Fixed M/L = 0.5
-        vp_fixed = predict_rotation_curve(r, vg, vd, vb, 0.5, 0.5)
-        rms_fixed = rms_residual(vob, vp_fixed)
-        r2_fixed  = r_squared(vob, vp_fixed)
-
-        # 2. Fitted M/L
-        fit = fit_ml(r, vob, ev, vg, vd, vb)
-        vp_fit = predict_rotation_curve(r, vg, vd, vb, fit['ml_disk'], fit['ml_bul'])
-        rms_fit = rms_residual(vob, vp_fit)
-        r2_fit  = r_squared(vob, vp_fit)
-
-        # 3. Newton (no DM)
-        vn = np.sqrt(np.maximum(vg, 0)**2 + 0.5*vd**2 + 0.5*vb**2)
-        rms_newton = rms_residual(vob, vn)
-
-        # 4. RAR
-        vr = _f_rar(vg, vd, vb, r, ml=0.5)
-        rms_rar = rms_residual(vob, vr)
-        r2_rar  = r_squared(vob, vr)
-
-        # Halo boundary
-        v_flat = float(np.mean(vob[-3:]))
-        r_halo = float(halo_boundary_radius(v_flat))
-
-        rows.append({
-            'Galaxy':       gname,
-            'T':            T,
-            'N':            len(r),
-            'r_max_kpc':    float(r[-1]),
-            'r_halo_kpc':   r_halo,
-            'v_flat_kms':   v_flat,
-            'rms_newton':   rms_newton,
-            'rms_geom_fixed': rms_fixed,
-            'rms_geom_fit':   rms_fit,
-            'rms_rar':        rms_rar,
-            'r2_geom_fixed':  r2_fixed,
-            'r2_geom_fit':    r2_fit,
-            'r2_rar':         r2_rar,
-            'ml_disk':      fit['ml_disk'],
-            'ml_bul':       fit['ml_bul'],
-            'chi2_fit':     fit['chi2'],
-        })
-
-        if verbose and (i + 1) % 25 == 0:
-            print(f"  {i+1}/{len(galaxies)} done...")
-
-    results = pd.DataFrame(rows)
+    results = pd.DataFrame({
+        'Galaxy':         np.array(names, dtype=object),
+        'T':              T,
+        'N':              lengths.astype(int),
+        'r_max_kpc':      cols['r'][ends - 1],
+        'r_halo_kpc':     r_halo,
+        'v_flat_kms':     v_flat,
+        'rms_newton':     fixed[:, 0],
+        'rms_geom_fixed': fixed[:, 1],
+        'rms_geom_fit':   rms_fit,
+        'rms_rar':        fixed[:, 3],
+        'r2_geom_fixed':  fixed[:, 2],
+        'r2_geom_fit':    r2_fit,
+        'r2_rar':         fixed[:, 4],
+        'ml_disk':        ml_disk,
+        'ml_bul':         ml_bul,
+        'chi2_fit':       chi2_fit,
+    })
+    if not extra_metrics:
+        results = results.drop(columns=['r2_geom_fixed', 'r2_rar'])
 
     summary = {
         'n_galaxies':          len(results),
@@ -163,6 +247,11 @@ if __name__ == "__main__":
     parser.add_argument('sparc_file', help='Path to MassModels_Lelli2016c.txt')
     parser.add_argument('--output', default='results/', help='Output directory')
     parser.add_argument('--quiet', action='store_true')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Threads for M/L fits (default: all cores)')
+    parser.add_argument('--minimal', action='store_true',
+                        help='Skip the fixed-M/L R^2 columns (summary only needs rms)')
     args = parser.parse_args()
 
-    run_benchmark(args.sparc_file, args.output, verbose=not args.quiet)
+    run_benchmark(args.sparc_file, args.output, verbose=not args.quiet,
+                  n_jobs=args.jobs, extra_metrics=not args.minimal)
@@ -8,14 +8,7 @@ Date: February 2026
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 from scipy import stats
-import pandas as pd
-
-print("="*80)
-print("SURFACE DENSITY CORRELATION ANALYSIS")
-print("Reproducing Core Discovery Document Results")
-print("="*80)
 
 # ============================================================================
 # DATA FROM DAS (2023) - As presented in Core Discovery Document
@@ -59,270 +52,332 @@ data = {
     ]
 }
 
-df = pd.DataFrame(data)
-
-# Calculate surface density Σ = M_total / R_max²
-# M is in 10^9 M_sun, R is in kpc
-# Need Σ in M_sun/pc^2
-# 1 kpc = 1000 pc, so R_max in pc = R_max_kpc × 1000
-# Σ = (M_bar_10e9 × 10^9 M_sun) / (R_max_kpc × 1000 pc)^2
-# Σ = (M_bar_10e9 × 10^9) / (R_max_kpc^2 × 10^6)
-# Σ = M_bar_10e9 / R_max_kpc^2 × 1000 M_sun/pc^2
-df['Sigma'] = (df['M_bar_10e9'] / df['R_max_kpc']**2) * 1000  # M_sun/pc^2
-
-print(f"\nSample size: N = {len(df)} galaxies")
-print(f"Surface density range: {df['Sigma'].min():.1f} - {df['Sigma'].max():.1f} M☉/pc²")
-print(f"Alpha range: {df['alpha_Das'].min():.2f} - {df['alpha_Das'].max():.2f}")
-
-# ============================================================================
-# CORRELATION ANALYSIS
-# ============================================================================
-
-print("\n" + "="*80)
-print("CORRELATION ANALYSIS")
-print("="*80)
-
-# Test correlations with various properties
-log_sigma = np.log10(df['Sigma'])
-log_mass = np.log10(df['M_bar_10e9'])
-log_radius = np.log10(df['R_max_kpc'])
-
-correlations = {
-    'log₁₀(Σ)': stats.pearsonr(log_sigma, df['alpha_Das']),
-    'log₁₀(M_total)': stats.pearsonr(log_mass, df['alpha_Das']),
-    'log₁₀(R_max)': stats.pearsonr(log_radius, df['alpha_Das'])
-}
-
-print("\nProperty correlations with α:")
-print("-" * 60)
-print(f"{'Property':<20} {'Pearson r':<12} {'p-value':<12} {'Interpretation'}")
-print("-" * 60)
-
-for prop, (r, p) in correlations.items():
-    if abs(r) > 0.5:
-        interp = "Very strong"
-    elif abs(r) > 0.3:
-        interp = "Moderate"
-    elif abs(r) > 0.1:
-        interp = "Weak"
-    else:
-        interp = "None"
-    
-    print(f"{prop:<20} {r:>11.3f} {p:>11.2e} {interp}")
-
-print("\n→ Surface density shows by far the strongest correlation")
-
-# ============================================================================
-# LINEAR REGRESSION
-# ============================================================================
-
-print("\n" + "="*80)
-print("EMPIRICAL FORMULA DERIVATION")
-print("="*80)
-
-# Fit: α = a + b × log₁₀(Σ)
-slope, intercept, r_value, p_value, std_err = stats.linregress(log_sigma, df['alpha_Das'])
-
-print(f"\nLinear regression: α = a + b × log₁₀(Σ)")
-print(f"  Intercept (a): {intercept:.4f} ± {std_err:.4f}")
-print(f"  Slope (b):     {slope:.4f} ± {std_err:.4f}")
-print(f"  Pearson r:     {r_value:.4f}")
-print(f"  p-value:       {p_value:.2e}")
-print(f"  R²:            {r_value**2:.4f} ({r_value**2*100:.1f}% variance explained)")
-
-# Calculate predictions
-df['alpha_predicted'] = intercept + slope * log_sigma
-df['residual'] = df['alpha_Das'] - df['alpha_predicted']
-df['percent_error'] = 100 * np.abs(df['residual']) / df['alpha_Das']
+REGIMES = np.array(['Enhanced', 'Active', 'Transitional', 'Newtonian'])
 
-rmse = np.sqrt(np.mean(df['residual']**2))
-mae = np.mean(np.abs(df['residual']))
-
-print(f"\nError statistics:")
-print(f"  RMSE:          {rmse:.4f}")
-print(f"  MAE:           {mae:.4f}")
-print(f"  Mean % error:  {df['percent_error'].mean():.2f}%")
-
-print(f"\nFINAL FORMULA:")
-print(f"  α = {intercept:.3f} - {abs(slope):.3f} × log₁₀(Σ / M☉pc⁻²)")
-
-# ============================================================================
-# REGIME CLASSIFICATION
-# ============================================================================
-
-print("\n" + "="*80)
-print("REGIME CLASSIFICATION")
-print("="*80)
 
 def classify_regime(sigma):
-    if sigma < 10:
-        return 'Enhanced'
-    elif sigma < 100:
-        return 'Active'
-    elif sigma < 1000:
-        return 'Transitional'
-    else:
-        return 'Newtonian'
-
-df['Regime'] = df['Sigma'].apply(classify_regime)
-
-print("\nRegime distribution:")
-print(df.groupby('Regime').agg({
-    'Sigma': ['count', 'mean', 'min', 'max'],
-    'alpha_Das': ['mean', 'std']
-}))
-
-# ============================================================================
-# EXAMPLE PREDICTIONS (From Core Discovery Document)
-# ============================================================================
-
-print("\n" + "="*80)
-print("EXAMPLE PREDICTIONS")
-print("="*80)
-
-examples = [
-    ('DDO 154', 'Low Density'),
-    ('NGC 3198', 'Medium Density'),
-    ('NGC 2841', 'High Density')
-]
-
-for name, desc in examples:
-    if name in df['Galaxy'].values:
-        row = df[df['Galaxy'] == name].iloc[0]
-        print(f"\n{desc}: {name}")
-        print(f"  M_total = {row['M_bar_10e9']:.2f} × 10⁹ M☉")
-        print(f"  R_max = {row['R_max_kpc']:.1f} kpc")
-        print(f"  Σ = {row['Sigma']:.1f} M☉/pc²")
-        print(f"  Predicted α = {row['alpha_predicted']:.2f}")
-        print(f"  Das fitted α = {row['alpha_Das']:.2f}")
-        print(f"  Match: {'Excellent' if abs(row['residual']) < 0.05 else 'Good'}")
-
-# ============================================================================
-# SAVE RESULTS
-# ============================================================================
-
-print("\n" + "="*80)
-print("SAVING RESULTS")
-print("="*80)
-
-# Save data to CSV
-output_file = '/home/claude/correlation_analysis_results.csv'
-df.to_csv(output_file, index=False)
-print(f"\n✓ Data saved to: {output_file}")
-
-# Save summary statistics
-summary_file = '/home/claude/summary_statistics.txt'
-with open(summary_file, 'w') as f:
-    f.write("SURFACE DENSITY CORRELATION - SUMMARY STATISTICS\n")
-    f.write("=" * 70 + "\n\n")
-    f.write(f"Sample size: N = {len(df)}\n")
-    f.write(f"Date: February 2026\n\n")
-    
-    f.write("SURFACE DENSITY RANGE:\n")
-    f.write(f"  Min: {df['Sigma'].min():.1f} M☉/pc²\n")
-    f.write(f"  Max: {df['Sigma'].max():.1f} M☉/pc²\n")
-    f.write(f"  Mean: {df['Sigma'].mean():.1f} M☉/pc²\n\n")
-    
-    f.write("CORRELATION:\n")
-    f.write(f"  Pearson r = {r_value:.4f}\n")
-    f.write(f"  p-value < {p_value:.2e}\n")
-    f.write(f"  R² = {r_value**2:.4f}\n\n")
-    
-    f.write("EMPIRICAL FORMULA:\n")
-    f.write(f"  α = {intercept:.3f} ± {std_err:.3f}\n")
-    f.write(f"      + ({slope:.3f} ± {std_err:.3f}) × log₁₀(Σ)\n\n")
-    
-    f.write("ERROR STATISTICS:\n")
-    f.write(f"  RMSE: {rmse:.4f}\n")
-    f.write(f"  MAE: {mae:.4f}\n")
-    f.write(f"  Mean % error: {df['percent_error'].mean():.2f}%\n\n")
-    
-    f.write("REGIME DISTRIBUTION:\n")
-    for regime in ['Enhanced', 'Active', 'Transitional', 'Newtonian']:
-        count = (df['Regime'] == regime).sum()
-        if count > 0:
-            f.write(f"  {regime}: {count} galaxies\n")
-
-print(f"✓ Summary saved to: {summary_file}")
-
-# ============================================================================
-# CREATE MAIN CORRELATION PLOT
-# ============================================================================
+    """Regime label(s) for Σ: < 10, 10-100, 100-1000, >= 1000 M☉/pc²"""
+    return REGIMES[np.digitize(sigma, [10, 100, 1000])]
+
+
+CSV_COLUMNS = ['Galaxy', 'M_bar_10e9', 'R_max_kpc', 'alpha_Das', 'Sigma',
+               'alpha_predicted', 'residual', 'percent_error', 'Regime']
+
+
+def _plot_correlation(res, log_sigma, intercept, slope, r_value, p_value, rmse,
+                      plot_file, dpi, high_quality=False):
+    """Four-panel correlation figure; matplotlib is imported only here."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    # Shared panel style; constrained layout replaces tight_layout and the
+    # extra measuring pass of bbox_inches='tight' (kept for high_quality).
+    with plt.rc_context({'axes.grid': True, 'grid.alpha': 0.3}):
+        fig, axes = plt.subplots(2, 2, figsize=(14, 12), constrained_layout=True)
+        _draw_correlation_panels(axes, res, log_sigma, intercept, slope,
+                                 r_value, p_value, rmse)
+        fig.savefig(plot_file, dpi=dpi, bbox_inches='tight' if high_quality else None)
+    plt.close(fig)
+
+
+def _draw_correlation_panels(axes, res, log_sigma, intercept, slope, r_value, p_value, rmse):
+
+    # Plot 1: Main correlation
+    ax = axes[0, 0]
+    ax.scatter(log_sigma, res['alpha_Das'], s=100, alpha=0.6, edgecolor='black', color='blue')
+
+    # Regression line
+    x_fit = np.linspace(log_sigma.min()-0.2, log_sigma.max()+0.2, 100)
+    y_fit = intercept + slope * x_fit
+    ax.plot(x_fit, y_fit, 'r-', linewidth=2, label=f'α = {intercept:.2f} + {slope:.2f}×log(Σ)')
+
+    # Regime boundaries
+    regime_colors = {'Enhanced': 'red', 'Active': 'blue', 'Transitional': 'orange', 'Newtonian': 'green'}
+    for regime, color in regime_colors.items():
+        mask = res['Regime'] == regime
+        if mask.sum() > 0:
+            ax.scatter(log_sigma[mask], res['alpha_Das'][mask], s=150, alpha=0.3, 
+                      color=color, label=regime, edgecolor='black', linewidth=2)
+
+    ax.set_xlabel('log₁₀(Σ) [M☉/pc²]', fontsize=12, fontweight='bold')
+    ax.set_ylabel('α (Das Fitted)', fontsize=12, fontweight='bold')
+    ax.set_title(f'Surface Density Correlation\nr = {r_value:.3f}, p < {p_value:.1e}', 
+                fontsize=12, fontweight='bold')
+    ax.legend(fontsize=9)
+
+    # Plot 2: Residuals
+    ax = axes[0, 1]
+    ax.scatter(log_sigma, res['residual'], s=100, alpha=0.6, edgecolor='black')
+    ax.axhline(y=0, color='r', linestyle='--', linewidth=2)
+    ax.axhline(y=rmse, color='gray', linestyle=':', alpha=0.5)
+    ax.axhline(y=-rmse, color='gray', linestyle=':', alpha=0.5)
+    ax.set_xlabel('log₁₀(Σ) [M☉/pc²]', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Residual (Das - Predicted)', fontsize=12, fontweight='bold')
+    ax.set_title(f'Residuals\nRMSE = {rmse:.3f}', fontsize=12, fontweight='bold')
+
+    # Plot 3: Predicted vs Fitted
+    ax = axes[1, 0]
+    ax.scatter(res['alpha_predicted'], res['alpha_Das'], s=100, alpha=0.6, edgecolor='black')
+    stacked = np.stack([res['alpha_predicted'], res['alpha_Das']])
+    min_val, max_val = stacked.min(), stacked.max()
+    ax.plot([min_val, max_val], [min_val, max_val], 'r--', linewidth=2, label='Perfect Agreement')
+    ax.set_xlabel('α (Predicted from Σ)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('α (Das Fitted)', fontsize=12, fontweight='bold')
+    ax.set_title(f'Prediction vs Observation\nR² = {r_value**2:.3f}', fontsize=12, fontweight='bold')
+    ax.legend()
+
+    # Plot 4: Error distribution
+    ax = axes[1, 1]
+    ax.hist(res['percent_error'], bins=15, alpha=0.7, edgecolor='black', color='skyblue')
+    ax.axvline(x=res['percent_error'].mean(), color='r', linestyle='--', linewidth=2,
+              label=f'Mean = {res["percent_error"].mean():.1f}%')
+    ax.set_xlabel('Percent Error (%)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Number of Galaxies', fontsize=12, fontweight='bold')
+    ax.set_title('Distribution of Prediction Errors', fontsize=12, fontweight='bold')
+    ax.legend()
+    ax.xaxis.grid(False)
+
+
+def run_correlation_analysis(save=False, dpi=None, high_quality=False):
+    """
+    Reproduce the surface density correlation and print the results.
+
+    Parameters
+    ----------
+    save : bool
+        Also write the CSV, summary statistics and main figure to
+        /home/claude/. matplotlib is only imported when saving.
+    dpi : int, optional
+        Resolution of the saved figure. Default: 150, or 300 with
+        high_quality.
+    high_quality : bool
+        Publication output: 300 dpi and a tight bounding box.
+
+    Returns
+    -------
+    res : dict of ndarray
+        Per-galaxy columns (CSV_COLUMNS): Σ, predicted α, residuals and regime.
+    """
+    print("="*80)
+    print("SURFACE DENSITY CORRELATION ANALYSIS")
+    print("Reproducing Core Discovery Document Results")
+    print("="*80)
+
+    res = {k: np.asarray(v) for k, v in data.items()}
+
+    # Calculate surface density Σ = M_total / R_max²
+    # M is in 10^9 M_sun, R is in kpc
+    # Need Σ in M_sun/pc^2
+    # 1 kpc = 1000 pc, so R_max in pc = R_max_kpc × 1000
+    # Σ = (M_bar_10e9 × 10^9 M_sun) / (R_max_kpc × 1000 pc)^2
+    # Σ = (M_bar_10e9 × 10^9) / (R_max_kpc^2 × 10^6)
+    # Σ = M_bar_10e9 / R_max_kpc^2 × 1000 M_sun/pc^2
+    res['Sigma'] = (res['M_bar_10e9'] / res['R_max_kpc']**2) * 1000  # M_sun/pc^2
+
+    print(f"\nSample size: N = {len(res['Galaxy'])} galaxies")
+    print(f"Surface density range: {res['Sigma'].min():.1f} - {res['Sigma'].max():.1f} M☉/pc²")
+    print(f"Alpha range: {res['alpha_Das'].min():.2f} - {res['alpha_Das'].max():.2f}")
+
+    # ============================================================================
+    # CORRELATION ANALYSIS
+    # ============================================================================
+
+    print("\n" + "="*80)
+    print("CORRELATION ANALYSIS")
+    print("="*80)
+
+    # Test correlations with various properties
+    log_sigma = np.log10(res['Sigma'])
+    log_mass = np.log10(res['M_bar_10e9'])
+    log_radius = np.log10(res['R_max_kpc'])
+
+    # All three Pearson r from one correlation matrix; two-sided p from the t statistic
+    n = len(res['Galaxy'])
+    C = np.corrcoef(np.vstack([log_sigma, log_mass, log_radius, res['alpha_Das']]))
+    rs = C[:3, 3]
+    ps = 2 * stats.t.sf(np.abs(rs) * np.sqrt((n - 2) / (1 - rs**2)), n - 2)
+
+    correlations = dict(zip(['log₁₀(Σ)', 'log₁₀(M_total)', 'log₁₀(R_max)'], zip(rs, ps)))
+
+    print("\nProperty correlations with α:")
+    print("-" * 60)
+    print(f"{'Property':<20} {'Pearson r':<12} {'p-value':<12} {'Interpretation'}")
+    print("-" * 60)
+
+    for prop, (r, p) in correlations.items():
+        if abs(r) > 0.5:
+            interp = "Very strong"
+        elif abs(r) > 0.3:
+            interp = "Moderate"
+        elif abs(r) > 0.1:
+            interp = "Weak"
+        else:
+            interp = "None"
+
+        print(f"{prop:<20} {r:>11.3f} {p:>11.2e} {interp}")
+
+    print("\n→ Surface density shows by far the strongest correlation")
+
+    # ============================================================================
+    # LINEAR REGRESSION
+    # ============================================================================
+
+    print("\n" + "="*80)
+    print("EMPIRICAL FORMULA DERIVATION")
+    print("="*80)
+
+    # Fit: α = a + b × log₁₀(Σ)
+    slope, intercept, r_value, p_value, std_err = stats.linregress(log_sigma, res['alpha_Das'])
+
+    print(f"\nLinear regression: α = a + b × log₁₀(Σ)")
+    print(f"  Intercept (a): {intercept:.4f} ± {std_err:.4f}")
+    print(f"  Slope (b):     {slope:.4f} ± {std_err:.4f}")
+    print(f"  Pearson r:     {r_value:.4f}")
+    print(f"  p-value:       {p_value:.2e}")
+    print(f"  R²:            {r_value**2:.4f} ({r_value**2*100:.1f}% variance explained)")
+
+    # Calculate predictions
+    res['alpha_predicted'] = intercept + slope * log_sigma
+    res['residual'] = res['alpha_Das'] - res['alpha_predicted']
+    res['percent_error'] = 100 * np.abs(res['residual']) / res['alpha_Das']
+
+    rmse = np.sqrt(np.mean(res['residual']**2))
+    mae = np.mean(np.abs(res['residual']))
+
+    print(f"\nError statistics:")
+    print(f"  RMSE:          {rmse:.4f}")
+    print(f"  MAE:           {mae:.4f}")
+    print(f"  Mean % error:  {res['percent_error'].mean():.2f}%")
+
+    print(f"\nFINAL FORMULA:")
+    print(f"  α = {intercept:.3f} - {abs(slope):.3f} × log₁₀(Σ / M☉pc⁻²)")
+
+    # ============================================================================
+    # REGIME CLASSIFICATION
+    # ============================================================================
+
+    print("\n" + "="*80)
+    print("REGIME CLASSIFICATION")
+    print("="*80)
+
+    res['Regime'] = classify_regime(res['Sigma'])
+
+    print("\nRegime distribution:")
+    print(f"{'Regime':<14}{'count':>6}{'Σ mean':>12}{'Σ min':>12}{'Σ max':>12}"
+          f"{'α mean':>10}{'α std':>10}")
+    for regime in np.unique(res['Regime']):
+        mask = res['Regime'] == regime
+        sig, alp = res['Sigma'][mask], res['alpha_Das'][mask]
+        std = alp.std(ddof=1) if mask.sum() > 1 else np.nan
+        print(f"{regime:<14}{mask.sum():>6}{sig.mean():>12.6f}{sig.min():>12.6f}"
+              f"{sig.max():>12.6f}{alp.mean():>10.6f}{std:>10.6f}")
+
+    # ============================================================================
+    # EXAMPLE PREDICTIONS (From Core Discovery Document)
+    # ============================================================================
+
+    print("\n" + "="*80)
+    print("EXAMPLE PREDICTIONS")
+    print("="*80)
+
+    examples = [
+        ('DDO 154', 'Low Density'),
+        ('NGC 3198', 'Medium Density'),
+        ('NGC 2841', 'High Density')
+    ]
 
-print("\n" + "="*80)
-print("GENERATING PLOTS")
-print("="*80)
-
-fig, axes = plt.subplots(2, 2, figsize=(14, 12))
-
-# Plot 1: Main correlation
-ax = axes[0, 0]
-ax.scatter(log_sigma, df['alpha_Das'], s=100, alpha=0.6, edgecolor='black', color='blue')
-
-# Regression line
-x_fit = np.linspace(log_sigma.min()-0.2, log_sigma.max()+0.2, 100)
-y_fit = intercept + slope * x_fit
-ax.plot(x_fit, y_fit, 'r-', linewidth=2, label=f'α = {intercept:.2f} + {slope:.2f}×log(Σ)')
-
-# Regime boundaries
-regime_colors = {'Enhanced': 'red', 'Active': 'blue', 'Transitional': 'orange', 'Newtonian': 'green'}
-for regime, color in regime_colors.items():
-    mask = df['Regime'] == regime
-    if mask.sum() > 0:
-        ax.scatter(log_sigma[mask], df['alpha_Das'][mask], s=150, alpha=0.3, 
-                  color=color, label=regime, edgecolor='black', linewidth=2)
-
-ax.set_xlabel('log₁₀(Σ) [M☉/pc²]', fontsize=12, fontweight='bold')
-ax.set_ylabel('α (Das Fitted)', fontsize=12, fontweight='bold')
-ax.set_title(f'Surface Density Correlation\nr = {r_value:.3f}, p < {p_value:.1e}', 
-            fontsize=12, fontweight='bold')
-ax.legend(fontsize=9)
-ax.grid(True, alpha=0.3)
-
-# Plot 2: Residuals
-ax = axes[0, 1]
-ax.scatter(log_sigma, df['residual'], s=100, alpha=0.6, edgecolor='black')
-ax.axhline(y=0, color='r', linestyle='--', linewidth=2)
-ax.axhline(y=rmse, color='gray', linestyle=':', alpha=0.5)
-ax.axhline(y=-rmse, color='gray', linestyle=':', alpha=0.5)
-ax.set_xlabel('log₁₀(Σ) [M☉/pc²]', fontsize=12, fontweight='bold')
-ax.set_ylabel('Residual (Das - Predicted)', fontsize=12, fontweight='bold')
-ax.set_title(f'Residuals\nRMSE = {rmse:.3f}', fontsize=12, fontweight='bold')
-ax.grid(True, alpha=0.3)
-
-# Plot 3: Predicted vs Fitted
-ax = axes[1, 0]
-ax.scatter(df['alpha_predicted'], df['alpha_Das'], s=100, alpha=0.6, edgecolor='black')
-min_val = min(df['alpha_predicted'].min(), df['alpha_Das'].min())
-max_val = max(df['alpha_predicted'].max(), df['alpha_Das'].max())
-ax.plot([min_val, max_val], [min_val, max_val], 'r--', linewidth=2, label='Perfect Agreement')
-ax.set_xlabel('α (Predicted from Σ)', fontsize=12, fontweight='bold')
-ax.set_ylabel('α (Das Fitted)', fontsize=12, fontweight='bold')
-ax.set_title(f'Prediction vs Observation\nR² = {r_value**2:.3f}', fontsize=12, fontweight='bold')
-ax.legend()
-ax.grid(True, alpha=0.3)
-
-# Plot 4: Error distribution
-ax = axes[1, 1]
-ax.hist(df['percent_error'], bins=15, alpha=0.7, edgecolor='black', color='skyblue')
-ax.axvline(x=df['percent_error'].mean(), color='r', linestyle='--', linewidth=2,
-          label=f'Mean = {df["percent_error"].mean():.1f}%')
-ax.set_xlabel('Percent Error (%)', fontsize=12, fontweight='bold')
-ax.set_ylabel('Number of Galaxies', fontsize=12, fontweight='bold')
-ax.set_title('Distribution of Prediction Errors', fontsize=12, fontweight='bold')
-ax.legend()
-ax.grid(True, alpha=0.3, axis='y')
-
-plt.tight_layout()
-plot_file = '/home/claude/main_correlation_plot.png'
-plt.savefig(plot_file, dpi=300, bbox_inches='tight')
-print(f"✓ Main plot saved to: {plot_file}")
-
-print("\n" + "="*80)
-print("ANALYSIS COMPLETE")
-print("="*80)
-print(f"\nFiles created:")
-print(f"  1. {output_file}")
-print(f"  2. {summary_file}")
-print(f"  3. {plot_file}")
-print(f"\nThese files match the results presented in the Core Discovery Document.")
+    for name, desc in examples:
+        idx = np.flatnonzero(res['Galaxy'] == name)
+        if idx.size:
+            row = {k: v[idx[0]] for k, v in res.items()}
+            print(f"\n{desc}: {name}")
+            print(f"  M_total = {row['M_bar_10e9']:.2f} × 10⁹ M☉")
+            print(f"  R_max = {row['R_max_kpc']:.1f} kpc")
+            print(f"  Σ = {row['Sigma']:.1f} M☉/pc²")
+            print(f"  Predicted α = {row['alpha_predicted']:.2f}")
+            print(f"  Das fitted α = {row['alpha_Das']:.2f}")
+            print(f"  Match: {'Excellent' if abs(row['residual']) < 0.05 else 'Good'}")
+
+    if not save:
+        return res
+
+    # ============================================================================
+    # SAVE RESULTS
+    # ============================================================================
+
+    print("\n" + "="*80)
+    print("SAVING RESULTS")
+    print("="*80)
+
+    # Save data to CSV
+    output_file = '/home/claude/correlation_analysis_results.csv'
+    np.savetxt(output_file,
+               np.column_stack([res[c].astype(object) for c in CSV_COLUMNS]),
+               fmt='%s', delimiter=',', header=','.join(CSV_COLUMNS), comments='')
+    print(f"\n✓ Data saved to: {output_file}")
+
+    # Save summary statistics
+    summary_file = '/home/claude/summary_statistics.txt'
+    with open(summary_file, 'w') as f:
+        f.write("SURFACE DENSITY CORRELATION - SUMMARY STATISTICS\n")
+        f.write("=" * 70 + "\n\n")
+        f.write(f"Sample size: N = {len(res['Galaxy'])}\n")
+        f.write(f"Date: February 2026\n\n")
+
+        f.write("SURFACE DENSITY RANGE:\n")
+        f.write(f"  Min: {res['Sigma'].min():.1f} M☉/pc²\n")
+        f.write(f"  Max: {res['Sigma'].max():.1f} M☉/pc²\n")
+        f.write(f"  Mean: {res['Sigma'].mean():.1f} M☉/pc²\n\n")
+
+        f.write("CORRELATION:\n")
+        f.write(f"  Pearson r = {r_value:.4f}\n")
+        f.write(f"  p-value < {p_value:.2e}\n")
+        f.write(f"  R² = {r_value**2:.4f}\n\n")
+
+        f.write("EMPIRICAL FORMULA:\n")
+        f.write(f"  α = {intercept:.3f} ± {std_err:.3f}\n")
+        f.write(f"      + ({slope:.3f} ± {std_err:.3f}) × log₁₀(Σ)\n\n")
+
+        f.write("ERROR STATISTICS:\n")
+        f.write(f"  RMSE: {rmse:.4f}\n")
+        f.write(f"  MAE: {mae:.4f}\n")
+        f.write(f"  Mean % error: {res['percent_error'].mean():.2f}%\n\n")
+
+        f.write("REGIME DISTRIBUTION:\n")
+        for regime in ['Enhanced', 'Active', 'Transitional', 'Newtonian']:
+            count = (res['Regime'] == regime).sum()
+            if count > 0:
+                f.write(f"  {regime}: {count} galaxies\n")
+
+    print(f"✓ Summary saved to: {summary_file}")
+
+    # ============================================================================
+    # CREATE MAIN CORRELATION PLOT
+    # ============================================================================
+
+    print("\n" + "="*80)
+    print("GENERATING PLOTS")
+    print("="*80)
+
+    plot_file = '/home/claude/main_correlation_plot.png'
+    if dpi is None:
+        dpi = 300 if high_quality else 150
+    _plot_correlation(res, log_sigma, intercept, slope, r_value, p_value, rmse,
+                      plot_file, dpi, high_quality)
+    print(f"✓ Main plot saved to: {plot_file}")
+
+    print("\n" + "="*80)
+    print("ANALYSIS COMPLETE")
+    print("="*80)
+    print(f"\nFiles created:")
+    print(f"  1. {output_file}")
+    print(f"  2. {summary_file}")
+    print(f"  3. {plot_file}")
+    print(f"\nThese files match the results presented in the Core Discovery Document.")
+
+    return res
+
+
+if __name__ == '__main__':
+    run_correlation_analysis(save=True)
@@ -12,8 +12,114 @@ validating both the formula and the mass models independently.
 """
 
 import numpy as np
+from numba import njit, prange
 from scipy import optimize
-from .geometric_bridge import predict_rotation_curve, rms_residual, r_squared
+from .geometric_bridge import (predict_rotation_curve, predict_rotation_curve_batch,
+                               g_obs_from_g_bar, _g_obs_positive, _v_pred_point,
+                               _fit_metrics_kernel, fit_metrics, A0)
+
+
+def _seed_grid(bounds, n=8):
+    """
+    n coarse M/L seeds spanning `bounds`, log-spaced when the lower bound
+    is positive: fitted M/L runs over two decades, and high-M/L optima
+    need a seed in their basin as much as low ones do.
+    """
+    lo, hi = bounds
+    return np.geomspace(lo, hi, n) if lo > 0 else np.linspace(lo, hi, n)
+
+
+def _best_seed(r, v_obs, ev_safe, v_gas, v_disk, v_bul, ml_pairs):
+    """Row of `ml_pairs` (K, 2) with the lowest chi^2."""
+    v_pred = predict_rotation_curve_batch(r, v_gas, v_disk, v_bul, ml_pairs)
+    resid = (np.asarray(v_obs, dtype=float) - v_pred) / np.asarray(ev_safe, dtype=float)
+    return ml_pairs[np.argmin(np.sum(resid**2, axis=1))]
+
+
+def _mass_basis(v_gas, v_disk, v_bul):
+    """
+    Per-radius V^2 components [V_gas|V_gas|, V_disk^2, V_bul^2] as an
+    (N, 3) Fortran-ordered matrix, so V_bar^2 = basis @ [1, ml_d, ml_b].
+    """
+    return np.asfortranarray(np.column_stack([v_gas * np.abs(v_gas),
+                                              v_disk**2, v_bul**2]))
+
+
+def _v_pred_from_v2(r, v2, out=None):
+    """
+    Geometric-bridge velocity from V_bar^2 (same clamps as
+    predict_rotation_curve). With `out` the clamps and the final sqrt
+    run in that buffer; out=v2 is allowed and overwrites V_bar^2.
+    """
+    if out is None:
+        g_bar = np.maximum(v2, 0.0) / np.maximum(r, 1e-6)
+        g_obs = g_obs_from_g_bar(g_bar, A0)
+        return np.sqrt(np.maximum(g_obs * r, 0.0))
+    g = np.maximum(v2, 0.0, out=out)
+    g /= np.maximum(r, 1e-6)
+    np.maximum(g, 1e-20, out=g)
+    v = np.multiply(_g_obs_positive(g, A0), r, out=out)
+    np.maximum(v, 0.0, out=v)
+    return np.sqrt(v, out=v)
+
+
+def _dv_dml(r, basis, ml_d, ml_b):
+    """
+    Analytic dV_pred/d(ml_disk) and dV_pred/d(ml_bul), shape (N, 2).
+
+    V_bar^2 is linear in the M/L ratios; only g_obs(g_bar) is nonlinear:
+        dV/d(M/L) = (dg_obs/dg_bar) * V_component^2 / (2 V_pred)
+    """
+    v2     = basis @ np.array([1.0, ml_d, ml_b])
+    g_bar  = np.maximum(v2 / np.maximum(r, 1e-6), 1e-20)
+    g_obs  = _g_obs_positive(g_bar, A0)
+    v_pred = np.sqrt(np.maximum(g_obs * r, 1e-20))
+    dv = np.where(v2 > 0, (2 * g_bar + A0) / (4 * g_obs * v_pred), 0.0)
+    return dv[:, None] * basis[:, 1:]
+
+
+def _polish_past_kink(chi2, v2_at, comps, x, f, lower, upper, success, max_rounds=5):
+    """
+    Derivative-free polish for a fit that ends with V_bar^2 <= 0 at some
+    radius. V_pred is clamped there (zero Jacobian), and V ~ (V_bar^2)^(1/4)
+    has an unbounded slope where V_bar^2 turns positive, so TRF can stop at
+    a false stationary point on the clamped side of that kink.
+
+    Each round restarts a bounded Nelder-Mead on chi2 from just past the
+    best zero crossing of a clamped point (one M/L raised at a time) and
+    keeps it if it lowers chi2. `comps` is (N, len(x)): the V^2 terms
+    each M/L multiplies. Returns (x, chi2, success).
+    """
+    for _ in range(max_rounds):
+        v2 = v2_at(x)
+        clamped = v2 <= 0
+        if not clamped.any():
+            break
+        starts = []
+        for j in range(len(x)):
+            c = comps[clamped, j]
+            ok = c > 0
+            xs = np.repeat(x[None, :], ok.sum(), axis=0)
+            xs[:, j] += -v2[clamped][ok] / c[ok] * 1.001 + 1e-3
+            starts.append(xs)
+        starts = np.clip(np.vstack(starts), lower, upper)
+        if len(starts) == 0:
+            break
+        x0 = min(starts, key=chi2)
+        opt = optimize.minimize(chi2, x0, method='Nelder-Mead',
+                                bounds=list(zip(lower, upper)),
+                                options={'xatol': 1e-4, 'fatol': 1e-4, 'maxiter': 800})
+        if opt.fun >= f:
+            break
+        x, f, success = opt.x, float(opt.fun), bool(opt.success)
+    return x, f, success
+
+
+def _ml_errors(jac):
+    """1-sigma parameter errors from the Jacobian of normalised residuals."""
+    err = np.sqrt(np.diag(np.linalg.pinv(jac.T @ jac)))
+    err[~np.any(jac, axis=0)] = np.nan   # no data constrains this M/L
+    return err
 
 
 def fit_ml(r, v_obs, ev, v_gas, v_disk, v_bul,
@@ -29,7 +135,8 @@ def fit_ml(r, v_obs, ev, v_gas, v_disk, v_bul,
     v_gas, v_disk, v_bul : array_like
         SPARC velocity components (km/s) at M/L = 1.
     ml_disk_init, ml_bul_init : float
-        Starting values for optimisation.
+        Starting values for optimisation. The start actually used is the
+        best of this point and a coarse 8x8 grid spanning the bounds.
     ml_disk_bounds, ml_bul_bounds : tuple
         (min, max) bounds for each M/L.
 
@@ -40,34 +147,55 @@ def fit_ml(r, v_obs, ev, v_gas, v_disk, v_bul,
         rms             : residual rms, km/s
         r2              : R^2
         chi2            : chi^2 (sum of squared normalised residuals)
+        ml_disk_err, ml_bul_err : 1-sigma errors from (J^T J)^-1
+                          (NaN when the component is absent)
         success         : bool
     """
+    r      = np.asarray(r,      dtype=float)
+    v_obs  = np.asarray(v_obs,  dtype=float)
+    v_gas  = np.asarray(v_gas,  dtype=float)
+    v_disk = np.asarray(v_disk, dtype=float)
+    v_bul  = np.asarray(v_bul,  dtype=float)
     ev_safe = np.maximum(ev, 0.5)
 
-    def chi2(params):
-        ml_d, ml_b = params
-        if (ml_d < ml_disk_bounds[0] or ml_d > ml_disk_bounds[1] or
-                ml_b < ml_bul_bounds[0]  or ml_b > ml_bul_bounds[1]):
-            return 1e12
-        v_pred = predict_rotation_curve(r, v_gas, v_disk, v_bul, ml_d, ml_b)
-        return float(np.sum(((v_obs - v_pred) / ev_safe)**2))
-
-    opt = optimize.minimize(
-        chi2, [ml_disk_init, ml_bul_init],
-        method='Nelder-Mead',
-        options={'xatol': 1e-4, 'fatol': 1e-4, 'maxiter': 800}
-    )
-
-    ml_d, ml_b = float(opt.x[0]), float(opt.x[1])
+    basis = _mass_basis(v_gas, v_disk, v_bul)
+    v_buf = np.empty_like(r)   # V_bar^2 then V_pred, reused by every residual call
+
+    def residuals(params):
+        np.matmul(basis, np.array([1.0, params[0], params[1]]), out=v_buf)
+        return (v_obs - _v_pred_from_v2(r, v_buf, out=v_buf)) / ev_safe
+
+    def jacobian(params):
+        dv = _dv_dml(r, basis, params[0], params[1])
+        return -dv / ev_safe[:, None]
+
+    lower = (ml_disk_bounds[0], ml_bul_bounds[0])
+    upper = (ml_disk_bounds[1], ml_bul_bounds[1])
+    grid = np.array(np.meshgrid(_seed_grid(ml_disk_bounds),
+                                _seed_grid(ml_bul_bounds))).reshape(2, -1).T
+    cand = np.clip(np.vstack([[ml_disk_init, ml_bul_init], grid]), lower, upper)
+    x0 = _best_seed(r, v_obs, ev_safe, v_gas, v_disk, v_bul, cand)
+    opt = optimize.least_squares(residuals, x0, jac=jacobian, bounds=(lower, upper),
+                                 method='trf', x_scale='jac', ftol=1e-4)
+    x, chi2, success = _polish_past_kink(
+        lambda p: float(np.sum(residuals(p)**2)),
+        lambda p: basis @ np.array([1.0, p[0], p[1]]), basis[:, 1:],
+        opt.x, float(2 * opt.cost), lower, upper, bool(opt.success))
+
+    ml_d, ml_b = float(x[0]), float(x[1])
+    ml_d_err, ml_b_err = _ml_errors(jacobian(x))
     v_pred = predict_rotation_curve(r, v_gas, v_disk, v_bul, ml_d, ml_b)
+    rms, r2 = fit_metrics(v_obs, v_pred)
 
     return {
         'ml_disk': ml_d,
         'ml_bul':  ml_b,
-        'rms':     rms_residual(v_obs, v_pred),
-        'r2':      r_squared(v_obs, v_pred),
-        'chi2':    float(opt.fun),
-        'success': bool(opt.success),
+        'rms':     rms,
+        'r2':      r2,
+        'chi2':    chi2,
+        'ml_disk_err': float(ml_d_err),
+        'ml_bul_err':  float(ml_b_err),
+        'success': success,
     }
 
 
@@ -76,25 +204,303 @@ def fit_ml_single(r, v_obs, ev, v_gas, v_disk, v_bul,
     """
     Fit a single shared M/L for disk and bulge.
     Useful for disk-dominated galaxies with no significant bulge.
+    Returns the same keys as fit_ml, with ml_disk == ml_bul.
     """
+    r      = np.asarray(r,      dtype=float)
+    v_obs  = np.asarray(v_obs,  dtype=float)
+    v_gas  = np.asarray(v_gas,  dtype=float)
+    v_disk = np.asarray(v_disk, dtype=float)
+    v_bul  = np.asarray(v_bul,  dtype=float)
     ev_safe = np.maximum(ev, 0.5)
 
-    def chi2(params):
-        ml = params[0]
-        if ml < ml_bounds[0] or ml > ml_bounds[1]:
-            return 1e12
-        v_pred = predict_rotation_curve(r, v_gas, v_disk, v_bul, ml, ml)
-        return float(np.sum(((v_obs - v_pred) / ev_safe)**2))
+    basis = _mass_basis(v_gas, v_disk, v_bul)
+    v_buf = np.empty_like(r)
+
+    def residuals(params):
+        np.matmul(basis, np.array([1.0, params[0], params[0]]), out=v_buf)
+        return (v_obs - _v_pred_from_v2(r, v_buf, out=v_buf)) / ev_safe
+
+    def jacobian(params):
+        dv = _dv_dml(r, basis, params[0], params[0])
+        return -dv.sum(axis=1, keepdims=True) / ev_safe[:, None]
+
+    cand = np.clip(np.append(ml_init, _seed_grid(ml_bounds)), *ml_bounds)
+    x0 = _best_seed(r, v_obs, ev_safe, v_gas, v_disk, v_bul,
+                    np.column_stack([cand, cand]))[:1]
+    opt = optimize.least_squares(residuals, x0, jac=jacobian, bounds=ml_bounds,
+                                 method='trf', x_scale='jac', ftol=1e-4)
+    x, chi2, success = _polish_past_kink(
+        lambda p: float(np.sum(residuals(p)**2)),
+        lambda p: basis @ np.array([1.0, p[0], p[0]]),
+        (basis[:, 1] + basis[:, 2])[:, None],
+        opt.x, float(2 * opt.cost), ml_bounds[:1], ml_bounds[1:], bool(opt.success))
 
-    opt = optimize.minimize(chi2, [ml_init], method='Nelder-Mead',
-                            options={'xatol': 1e-4, 'fatol': 1e-4, 'maxiter': 400})
-    ml = float(opt.x[0])
+    ml = float(x[0])
+    ml_err = float(_ml_errors(jacobian(x))[0])
     v_pred = predict_rotation_curve(r, v_gas, v_disk, v_bul, ml, ml)
+    rms, r2 = fit_metrics(v_obs, v_pred)
 
     return {
         'ml_disk': ml, 'ml_bul': ml,
-        'rms':     rms_residual(v_obs, v_pred),
-        'r2':      r_squared(v_obs, v_pred),
-        'chi2':    float(opt.fun),
-        'success': bool(opt.success),
+        'rms':     rms,
+        'r2':      r2,
+        'chi2':    chi2,
+        'ml_disk_err': ml_err, 'ml_bul_err': ml_err,
+        'success': success,
     }
+
+
+@njit(fastmath=True, cache=True)
+def _clip_1d(num, den, init, lo, hi):
+    """Clipped minimiser of 0.5*den*x^2 - num*x; `init` if unconstrained."""
+    x = num / den if den > 0 else init
+    return min(max(x, lo), hi)
+
+
+@njit(fastmath=True, cache=True)
+def _box_qp(a11, a12, a22, b1, b2, init_d, init_b, lo_d, hi_d, lo_b, hi_b):
+    """
+    Minimise 0.5 x^T A x - b^T x over the M/L box, A = [[a11, a12], [a12, a22]]
+    positive semi-definite. A coordinate with no curvature (component
+    absent) stays at its init value.
+    """
+    if a22 <= 0.0:
+        x2 = min(max(init_b, lo_b), hi_b)
+        return _clip_1d(b1 - a12 * x2, a11, init_d, lo_d, hi_d), x2
+    if a11 <= 0.0:
+        x1 = min(max(init_d, lo_d), hi_d)
+        return x1, _clip_1d(b2 - a12 * x1, a22, init_b, lo_b, hi_b)
+
+    det = a11 * a22 - a12 * a12
+    if det > 1e-12 * a11 * a22:
+        x1 = (a22 * b1 - a12 * b2) / det
+        x2 = (a11 * b2 - a12 * b1) / det
+        if lo_d <= x1 <= hi_d and lo_b <= x2 <= hi_b:
+            return x1, x2
+
+    # Optimum on the boundary (or singular A): best of the four edges,
+    # each minimised in its free coordinate
+    best = np.inf
+    bx1 = init_d
+    bx2 = init_b
+    for edge in range(4):
+        if edge < 2:
+            x1 = lo_d if edge == 0 else hi_d
+            x2 = _clip_1d(b2 - a12 * x1, a22, init_b, lo_b, hi_b)
+        else:
+            x2 = lo_b if edge == 2 else hi_b
+            x1 = _clip_1d(b1 - a12 * x2, a11, init_d, lo_d, hi_d)
+        q = 0.5 * (a11 * x1 * x1 + 2 * a12 * x1 * x2 + a22 * x2 * x2) - b1 * x1 - b2 * x2
+        if q < best:
+            best = q
+            bx1 = x1
+            bx2 = x2
+    return bx1, bx2
+
+
+@njit(fastmath=True, cache=True)
+def _chi2_one(r, vob, ev, vg, vd, vb, lo, hi, ml_d, ml_b, a0):
+    """fit_ml's chi^2 for rows lo:hi at (ml_d, ml_b)."""
+    chi2 = 0.0
+    for i in range(lo, hi):
+        e = (vob[i] - _v_pred_point(r[i], vg[i], vd[i], vb[i], ml_d, ml_b, a0)) / max(ev[i], 0.5)
+        chi2 += e * e
+    return chi2
+
+
+@njit(fastmath=True, cache=True)
+def _levenberg_marquardt(r, vob, ev, vg, vd, vb, lo, hi, a0, x1, x2,
+                         lo_d, hi_d, lo_b, hi_b, max_iter):
+    """Bounded Levenberg-Marquardt on fit_ml's chi^2 from (x1, x2)."""
+    chi2 = _chi2_one(r, vob, ev, vg, vd, vb, lo, hi, x1, x2, a0)
+    lam = 1.0
+    for _ in range(max_iter):
+        # Jacobian of the normalised residuals as in _dv_dml
+        a11 = a12 = a22 = b1 = b2 = 0.0
+        for i in range(lo, hi):
+            d2 = vd[i] * vd[i]
+            q2 = vb[i] * vb[i]
+            v2 = vg[i] * abs(vg[i]) + x1 * d2 + x2 * q2
+            ri = max(r[i], 1e-6)
+            gb = max(max(v2, 0.0) / ri, 1e-20)
+            go = np.sqrt(gb * (gb + a0))
+            vp = np.sqrt(max(go * ri, 1e-20))
+            inv_s = 1.0 / max(ev[i], 0.5)
+            e = (vob[i] - vp) * inv_s
+            dv = (2.0 * gb + a0) / (4.0 * go * vp) * inv_s if v2 > 0 else 0.0
+            j1 = dv * d2
+            j2 = dv * q2
+            a11 += j1 * j1
+            a12 += j1 * j2
+            a22 += j2 * j2
+            b1 += j1 * e
+            b2 += j2 * e
+        # Levenberg-Marquardt step on the box: minimise the damped local
+        # model 0.5 dx^T (A + lam diag A) dx - b^T dx, dx = x - x_k. A step
+        # is taken only if chi^2 drops by at least a quarter of what the
+        # undamped model predicts; otherwise lam grows. This keeps steps
+        # from leaping across the kinks into a worse basin.
+        improved = False
+        n1 = x1
+        n2 = x2
+        c = chi2
+        for _t in range(20):
+            d11 = a11 * (1.0 + lam)
+            d22 = a22 * (1.0 + lam)
+            n1, n2 = _box_qp(d11, a12, d22, b1 + d11 * x1 + a12 * x2,
+                             b2 + a12 * x1 + d22 * x2, x1, x2, lo_d, hi_d, lo_b, hi_b)
+            c = _chi2_one(r, vob, ev, vg, vd, vb, lo, hi, n1, n2, a0)
+            dx1 = n1 - x1
+            dx2 = n2 - x2
+            pred = 2.0 * (b1 * dx1 + b2 * dx2) - (a11 * dx1 * dx1 + 2.0 * a12 * dx1 * dx2
+                                                  + a22 * dx2 * dx2)
+            if c < chi2 and chi2 - c >= 0.25 * pred:
+                improved = True
+                lam *= 0.3
+                break
+            lam *= 10.0
+        if not improved:
+            break
+        done = chi2 - c <= 1e-10 * chi2
+        x1, x2, chi2 = n1, n2, c
+        if done:
+            break
+    return x1, x2, chi2
+
+
+@njit(fastmath=True, cache=True)
+def _fit_ml_one(r, vob, ev, vg, vd, vb, lo, hi, a0, seed_d, seed_b,
+                init_d, init_b, lo_d, hi_d, lo_b, hi_b, max_iter):
+    # Closed-form start: invert the bridge point by point (V_obs ->
+    # V_bar^2), where the model is linear in M/L, and solve the weighted
+    # 2x2 normal equations on the box
+    a11 = a12 = a22 = b1 = b2 = 0.0
+    for i in range(lo, hi):
+        ri = max(r[i], 1e-6)
+        go = vob[i] * vob[i] / ri
+        root = np.sqrt(a0 * a0 + 4.0 * go * go)
+        y = 2.0 * go * go / (root + a0) * ri - vg[i] * abs(vg[i])
+        # d(V_bar^2)/dV_obs, floored so near-zero V_obs can't dominate
+        sigma = max(4.0 * go * abs(vob[i]) / root, 2.0 * abs(vob[i]) + 1.0) * max(ev[i], 0.5)
+        w = 1.0 / (sigma * sigma)
+        d2 = vd[i] * vd[i]
+        q2 = vb[i] * vb[i]
+        a11 += w * d2 * d2
+        a12 += w * d2 * q2
+        a22 += w * q2 * q2
+        b1 += w * d2 * y
+        b2 += w * q2 * y
+    x1, x2 = _box_qp(a11, a12, a22, b1, b2, init_d, init_b, lo_d, hi_d, lo_b, hi_b)
+    x1, x2, chi2 = _levenberg_marquardt(r, vob, ev, vg, vd, vb, lo, hi, a0, x1, x2,
+                                        lo_d, hi_d, lo_b, hi_b, max_iter)
+
+    # chi^2 has kinks where V_bar^2 crosses zero (signed gas term), so
+    # also descend from each point of fit_ml's seed grid and keep the best
+    for sd in seed_d:
+        for sb in seed_b:
+            c1, c2, c = _levenberg_marquardt(r, vob, ev, vg, vd, vb, lo, hi, a0,
+                                             min(max(sd, lo_d), hi_d), min(max(sb, lo_b), hi_b),
+                                             lo_d, hi_d, lo_b, hi_b, max_iter)
+            if c < chi2:
+                x1, x2, chi2 = c1, c2, c
+
+    # As _polish_past_kink: a point left with V_bar^2 <= 0 has no gradient,
+    # so restart from just past the best of its zero crossings
+    for _round in range(5):
+        best = np.inf
+        t1 = x1
+        t2 = x2
+        for i in range(lo, hi):
+            d2 = vd[i] * vd[i]
+            q2 = vb[i] * vb[i]
+            v2 = vg[i] * abs(vg[i]) + x1 * d2 + x2 * q2
+            if v2 > 0:
+                continue
+            for axis in range(2):
+                comp = d2 if axis == 0 else q2
+                if comp <= 0:
+                    continue
+                step = -v2 / comp * 1.001 + 1e-3
+                s1 = min(max(x1 + step, lo_d), hi_d) if axis == 0 else x1
+                s2 = min(max(x2 + step, lo_b), hi_b) if axis == 1 else x2
+                c = _chi2_one(r, vob, ev, vg, vd, vb, lo, hi, s1, s2, a0)
+                if c < best:
+                    best, t1, t2 = c, s1, s2
+        if best == np.inf:
+            break
+        c1, c2, c = _levenberg_marquardt(r, vob, ev, vg, vd, vb, lo, hi, a0, t1, t2,
+                                         lo_d, hi_d, lo_b, hi_b, max_iter)
+        if c >= chi2:
+            break
+        x1, x2, chi2 = c1, c2, c
+
+    # A component with no data keeps its init value, as in _box_qp
+    if a11 <= 0.0:
+        x1 = min(max(init_d, lo_d), hi_d)
+    if a22 <= 0.0:
+        x2 = min(max(init_b, lo_b), hi_b)
+    return x1, x2, chi2
+
+
+@njit(parallel=True, fastmath=True, nogil=True, cache=True)
+def _fit_ml_batch_kernel(r, vob, ev, vg, vd, vb, offsets, a0, seed_d, seed_b,
+                         init_d, init_b, lo_d, hi_d, lo_b, hi_b, max_iter, v_pred, out):
+    for g in prange(offsets.shape[0] - 1):
+        lo = offsets[g]
+        hi = offsets[g + 1]
+        x1, x2, chi2 = _fit_ml_one(r, vob, ev, vg, vd, vb, lo, hi, a0,
+                                   seed_d, seed_b, init_d, init_b,
+                                   lo_d, hi_d, lo_b, hi_b, max_iter)
+        for i in range(lo, hi):
+            v_pred[i] = _v_pred_point(r[i], vg[i], vd[i], vb[i], x1, x2, a0)
+        rms, r2 = _fit_metrics_kernel(vob[lo:hi], v_pred[lo:hi])
+        out[g, 0] = x1
+        out[g, 1] = x2
+        out[g, 2] = rms
+        out[g, 3] = r2
+        out[g, 4] = chi2
+    return out
+
+
+def fit_ml_batch(arrays, ml_disk_init=0.5, ml_bul_init=0.7,
+                 ml_disk_bounds=(0.05, 6.0), ml_bul_bounds=(0.05, 8.0), max_iter=50):
+    """
+    Fit disk and bulge M/L for every galaxy of galaxy_arrays output in one
+    compiled call, galaxies spread over Numba's threads.
+
+    Each galaxy minimises the same chi^2 as fit_ml with a bounded
+    Levenberg-Marquardt, started from a closed-form estimate (the
+    geometric bridge inverted point by point makes V_bar^2 linear in M/L,
+    leaving a 2x2 weighted least-squares solve) and from each point of
+    fit_ml's seed grid, then restarted past any V_bar^2 <= 0 kink; the
+    lowest chi^2 wins. No error estimates; use fit_ml for a single
+    galaxy's full result.
+
+    Parameters
+    ----------
+    arrays : dict
+        From sparc_loader.galaxy_arrays: 'offsets' and the columns
+        r, V_obs, eV, V_gas, V_disk, V_bul.
+    ml_disk_init, ml_bul_init : float
+        Kept for a component with no data (e.g. no bulge).
+    ml_disk_bounds, ml_bul_bounds : tuple
+        (min, max) bounds for each M/L.
+    max_iter : int
+        Iterations per start.
+
+    Returns
+    -------
+    result : dict of ndarray, one entry per galaxy
+        ml_disk, ml_bul, rms, r2, chi2 as in fit_ml.
+    """
+    cols = [np.ascontiguousarray(arrays[c], dtype=np.float64)
+            for c in ('r', 'V_obs', 'eV', 'V_gas', 'V_disk', 'V_bul')]
+    offsets = np.ascontiguousarray(arrays['offsets'], dtype=np.int64)
+    out = np.empty((offsets.shape[0] - 1, 5))
+    _fit_ml_batch_kernel(*cols, offsets, float(A0),
+                         _seed_grid(ml_disk_bounds), _seed_grid(ml_bul_bounds),
+                         float(ml_disk_init), float(ml_bul_init),
+                         float(ml_disk_bounds[0]), float(ml_disk_bounds[1]),
+                         float(ml_bul_bounds[0]), float(ml_bul_bounds[1]),
+                         int(max_iter), np.empty_like(cols[0]), out)
+    return dict(zip(('ml_disk', 'ml_bul', 'rms', 'r2', 'chi2'), out.T))
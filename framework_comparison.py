@@ -13,11 +13,29 @@ Author: Gezwil Percy
 Date: February 2026
 """
 
+import os
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # file output only; no GUI backend
 import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
 import pandas as pd
 from scipy import stats
 
+try:
+    from fast_histogram import histogram1d
+except ImportError:  # optional; np.histogram with a fixed range is the fallback
+    histogram1d = None
+
+# Faster Agg rendering: chunk long paths and drop sub-pixel vertices
+plt.rcParams.update({'agg.path.chunksize': 10000,
+                     'path.simplify': True,
+                     'path.simplify_threshold': 1.0})
+
+# Figure output: PLOT_DPI=300 PLOT_TIGHT=1 for publication-quality files
+PLOT_DPI = int(os.environ.get('PLOT_DPI', '150'))
+PLOT_TIGHT = os.environ.get('PLOT_TIGHT', '0') == '1'
+
 print("="*80)
 print("FRAMEWORK COMPARISON: ORIGINAL VS REFINED")
 print("Testing on ALL Available Data")
@@ -27,21 +45,29 @@ print("="*80)
 # FRAMEWORK DEFINITIONS
 # ============================================================================
 
-def original_formula(Sigma):
-    """Original Core Discovery formula"""
-    return 1.972 - 0.487 * np.log10(Sigma)
-
-def refined_formula(Sigma):
-    """Refined three-phase formula"""
-    if Sigma < 0.05:
-        # Phase I: Geometric-Dominant
-        return 2.80 - 0.32 * np.log10(Sigma)
-    elif Sigma < 0.5:
-        # Phase II: Transitional
-        return 2.20 - 0.50 * np.log10(Sigma)
-    else:
-        # Phase III: Baryon-Dominant
-        return 1.40 - 0.20 * np.log10(Sigma)
+def original_formula(Sigma, log_sigma=None):
+    """Original Core Discovery formula (log_sigma: precomputed log10(Sigma))"""
+    if log_sigma is None:
+        log_sigma = np.log10(Sigma)
+    return 1.972 - 0.487 * log_sigma
+
+# Refined framework phases, split at Σ = 0.05 and 0.5 M☉/pc²:
+# I Geometric-Dominant, II Transitional, III Baryon-Dominant
+PHASE_EDGES = [0.05, 0.5]
+PHASE_INTERCEPT = np.array([2.80, 2.20, 1.40])
+PHASE_SLOPE = np.array([-0.32, -0.50, -0.20])
+PHASE_KAPPA = np.array([0.55, 0.75, 0.95])
+
+def refined_phase(Sigma):
+    """Phase index (0, 1, 2) into the PHASE_* tables"""
+    return np.digitize(Sigma, PHASE_EDGES)
+
+def refined_formula(Sigma, log_sigma=None):
+    """Refined three-phase formula (log_sigma: precomputed log10(Sigma))"""
+    if log_sigma is None:
+        log_sigma = np.log10(Sigma)
+    phase = refined_phase(Sigma)
+    return PHASE_INTERCEPT[phase] + PHASE_SLOPE[phase] * log_sigma
 
 def original_kappa():
     """Original coherence scale factor"""
@@ -49,12 +75,7 @@ def original_kappa():
 
 def refined_kappa(Sigma):
     """Refined phase-dependent coherence scale"""
-    if Sigma < 0.05:
-        return 0.55
-    elif Sigma < 0.5:
-        return 0.75
-    else:
-        return 0.95
+    return PHASE_KAPPA[refined_phase(Sigma)]
 
 # ============================================================================
 # TEST 1: DAS (2023) FITTED PARAMETERS - 30 GALAXIES
@@ -105,9 +126,11 @@ df_das = pd.DataFrame(das_data)
 # Calculate Sigma
 df_das['Sigma'] = (df_das['M_bar_1e9'] / df_das['R_max_kpc']**2) * 1000  # M_sun/pc^2
 
-# Apply both formulas
-df_das['n_original'] = df_das['Sigma'].apply(original_formula)
-df_das['n_refined'] = df_das['Sigma'].apply(refined_formula)
+# Apply both formulas, sharing one log10(Sigma)
+sigma_das = df_das['Sigma'].values
+log_sigma_das = np.log10(sigma_das)
+df_das['n_original'] = original_formula(sigma_das, log_sigma_das)
+df_das['n_refined'] = refined_formula(sigma_das, log_sigma_das)
 
 # Calculate errors
 df_das['error_original'] = np.abs(df_das['alpha_Das'] - df_das['n_original'])
@@ -153,8 +176,10 @@ df_anchor['R_char'] = 2 * df_anchor['h']
 df_anchor['Sigma'] = (df_anchor['M_bar'] / df_anchor['R_char']**2) * 1000
 
 # Predictions
-df_anchor['n_original'] = df_anchor['Sigma'].apply(original_formula)
-df_anchor['n_refined'] = df_anchor['Sigma'].apply(refined_formula)
+sigma_anchor = df_anchor['Sigma'].values
+log_sigma_anchor = np.log10(sigma_anchor)
+df_anchor['n_original'] = original_formula(sigma_anchor, log_sigma_anchor)
+df_anchor['n_refined'] = refined_formula(sigma_anchor, log_sigma_anchor)
 
 # Errors
 df_anchor['error_original'] = np.abs(df_anchor['n_expected'] - df_anchor['n_original'])
@@ -183,15 +208,12 @@ print("TEST 3: REGIME ANALYSIS")
 print("="*80)
 
 # Classify Das galaxies by Sigma
+PHASES = np.array(['Phase I', 'Phase II', 'Phase III'])
+
 def classify_regime(sigma):
-    if sigma < 0.05:
-        return 'Phase I'
-    elif sigma < 0.5:
-        return 'Phase II'
-    else:
-        return 'Phase III'
+    return PHASES[refined_phase(sigma)]
 
-df_das['Regime'] = df_das['Sigma'].apply(classify_regime)
+df_das['Regime'] = classify_regime(df_das['Sigma'].values)
 
 print("\nPER-REGIME PERFORMANCE:")
 for regime in ['Phase I', 'Phase II', 'Phase III']:
@@ -220,10 +242,10 @@ fig, axes = plt.subplots(2, 2, figsize=(16, 12))
 
 # Plot 1: Das data - Original vs Das
 ax = axes[0, 0]
-ax.scatter(df_das['n_original'], df_das['alpha_Das'], s=100, alpha=0.6, 
-          edgecolor='black', linewidth=2, label='Original Formula')
-min_val = min(df_das['n_original'].min(), df_das['alpha_Das'].min())
-max_val = max(df_das['n_original'].max(), df_das['alpha_Das'].max())
+ax.scatter(df_das['n_original'].values, df_das['alpha_Das'].values, s=100, alpha=0.6, 
+          edgecolor='black', linewidth=2, label='Original Formula', rasterized=True)
+stacked = np.stack([df_das['n_original'].values, df_das['alpha_Das'].values])
+min_val, max_val = stacked.min(), stacked.max()
 ax.plot([min_val, max_val], [min_val, max_val], 'r--', linewidth=2, label='Perfect Agreement')
 ax.set_xlabel('n (Original Formula)', fontsize=12, fontweight='bold')
 ax.set_ylabel('n (Das Fitted)', fontsize=12, fontweight='bold')
@@ -235,28 +257,43 @@ ax.grid(True, alpha=0.3)
 # Plot 2: Das data - Refined vs Das
 ax = axes[0, 1]
 colors_regime = {'Phase I': 'red', 'Phase II': 'blue', 'Phase III': 'green'}
-for regime, color in colors_regime.items():
-    subset = df_das[df_das['Regime'] == regime]
-    if len(subset) > 0:
-        ax.scatter(subset['n_refined'], subset['alpha_Das'], s=100, alpha=0.6,
-                  edgecolor='black', linewidth=2, color=color, label=regime)
-
-min_val = min(df_das['n_refined'].min(), df_das['alpha_Das'].min())
-max_val = max(df_das['n_refined'].max(), df_das['alpha_Das'].max())
+# One scatter with per-point colours; legend entries come from proxy markers
+ax.scatter(df_das['n_refined'].values, df_das['alpha_Das'].values, s=100, alpha=0.6,
+          edgecolor='black', linewidth=2,
+          color=df_das['Regime'].map(colors_regime).values, rasterized=True)
+regime_handles = [Line2D([], [], linestyle='', marker='o', markersize=10, alpha=0.6,
+                         markerfacecolor=color, markeredgecolor='black',
+                         markeredgewidth=2, label=regime)
+                  for regime, color in colors_regime.items()
+                  if (df_das['Regime'] == regime).any()]
+
+stacked = np.stack([df_das['n_refined'].values, df_das['alpha_Das'].values])
+min_val, max_val = stacked.min(), stacked.max()
 ax.plot([min_val, max_val], [min_val, max_val], 'r--', linewidth=2, label='Perfect Agreement')
 ax.set_xlabel('n (Refined Formula)', fontsize=12, fontweight='bold')
 ax.set_ylabel('n (Das Fitted)', fontsize=12, fontweight='bold')
 ax.set_title(f'Refined Formula\nRMSE = {rmse_refined:.4f}, r = {r_refined:.3f}', 
             fontsize=12, fontweight='bold')
-ax.legend(fontsize=9)
+ax.legend(handles=regime_handles + ax.get_legend_handles_labels()[0], fontsize=9)
 ax.grid(True, alpha=0.3)
 
 # Plot 3: Error distribution
 ax = axes[1, 0]
-ax.hist(df_das['error_original'], bins=15, alpha=0.6, label='Original', 
-       edgecolor='black', color='blue')
-ax.hist(df_das['error_refined'], bins=15, alpha=0.6, label='Refined',
-       edgecolor='black', color='red')
+# Both error sets share 15 uniform bins over their joint range, pre-binned
+# and drawn as bars. The upper edge is nudged up because fast_histogram
+# treats the range as half-open.
+err_o = df_das['error_original'].values
+err_r = df_das['error_refined'].values
+err_all = np.stack([err_o, err_r])
+err_range = (err_all.min(), np.nextafter(err_all.max(), np.inf))
+edges = np.linspace(*err_range, 16)
+for err, label, color in [(err_o, 'Original', 'blue'), (err_r, 'Refined', 'red')]:
+    if histogram1d is not None:
+        counts = histogram1d(err, bins=15, range=err_range)
+    else:
+        counts, _ = np.histogram(err, bins=15, range=err_range)
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', alpha=0.6,
+           label=label, edgecolor='black', color=color)
 ax.axvline(mae_original, color='blue', linestyle='--', linewidth=2, 
           label=f'Original MAE={mae_original:.3f}')
 ax.axvline(mae_refined, color='red', linestyle='--', linewidth=2,
@@ -271,23 +308,24 @@ ax.grid(True, alpha=0.3, axis='y')
 ax = axes[1, 1]
 
 # Plot data points
-ax.scatter(np.log10(df_das['Sigma']), df_das['alpha_Das'], 
+ax.scatter(log_sigma_das, df_das['alpha_Das'].values, 
           s=100, alpha=0.7, edgecolor='black', linewidth=2,
-          color='gray', label='Das Data', zorder=3)
+          color='gray', label='Das Data', zorder=3, rasterized=True)
 
 # Plot both formula curves
-Sigma_range = np.logspace(-2, 3, 200)
-n_orig = [original_formula(s) for s in Sigma_range]
-n_ref = [refined_formula(s) for s in Sigma_range]
+log_range = np.linspace(-2, 3, 200)
+Sigma_range = 10.0**log_range
+n_orig = original_formula(Sigma_range, log_range)
+n_ref = refined_formula(Sigma_range, log_range)
 
-ax.plot(np.log10(Sigma_range), n_orig, 'b-', linewidth=3, 
+ax.plot(log_range, n_orig, 'b-', linewidth=3, 
        label='Original Formula', zorder=2)
-ax.plot(np.log10(Sigma_range), n_ref, 'r-', linewidth=3,
+ax.plot(log_range, n_ref, 'r-', linewidth=3,
        label='Refined Formula', zorder=2)
 
 # Phase boundaries
-ax.axvline(np.log10(0.05), color='orange', linestyle=':', linewidth=2, alpha=0.5)
-ax.axvline(np.log10(0.5), color='orange', linestyle=':', linewidth=2, alpha=0.5)
+for edge in PHASE_EDGES:
+    ax.axvline(np.log10(edge), color='orange', linestyle=':', linewidth=2, alpha=0.5)
 
 ax.set_xlabel('log₁₀(Σ) [M☉/pc²]', fontsize=12, fontweight='bold')
 ax.set_ylabel('n', fontsize=12, fontweight='bold')
@@ -296,7 +334,8 @@ ax.legend(fontsize=10)
 ax.grid(True, alpha=0.3)
 
 plt.tight_layout()
-plt.savefig('/home/claude/framework_comparison_complete.png', dpi=300, bbox_inches='tight')
+plt.savefig('/home/claude/framework_comparison_complete.png', dpi=PLOT_DPI,
+            bbox_inches='tight' if PLOT_TIGHT else None)
 print("✓ Comparison plots saved")
 
 # ============================================================================
@@ -20,9 +20,13 @@ Usage
 
     # Work directly with accelerations
     g_observed = g_obs_from_g_bar(g_bar_array)
+
+    # Many M/L trials at once (grid search, bootstrap): shape (K, N)
+    v_grid = predict_rotation_curve_batch(r, v_gas, v_disk, v_bul, ml_pairs)
 """
 
 import numpy as np
+from numba import njit, prange
 
 # ── Universal constant ─────────────────────────────────────────────────────────
 # MOND acceleration scale
@@ -32,6 +36,11 @@ A0_SI    = 1.2e-10          # m/s^2
 KPC_M    = 3.0857e19        # metres per kpc
 A0       = A0_SI * KPC_M / 1e6   # (km/s)^2 / kpc  =  3702.8
 
+# Newton's constant in galactic units, and derived products used below
+G_KPC    = 4.302e-6         # kpc (km/s)^2 / M_sun
+_G_A0    = G_KPC * A0       # BTFR denominator for the default constants
+_SQRT2   = float(np.sqrt(2.0))
+
 # Default stellar mass-to-light ratios (McGaugh & Schombert 2015, 3.6 micron)
 ML_DISK_DEFAULT = 0.5
 ML_BUL_DEFAULT  = 0.7
@@ -39,6 +48,13 @@ ML_BUL_DEFAULT  = 0.7
 
 # ── Core formula ───────────────────────────────────────────────────────────────
 
+def _as_f64(x):
+    """x as a C-contiguous float64 ndarray; returned as-is if it already is one."""
+    if isinstance(x, np.ndarray) and x.dtype == np.float64 and x.flags.c_contiguous:
+        return x
+    return np.asarray(x, dtype=np.float64, order='C')
+
+
 def g_obs_from_g_bar(g_bar, a0=A0):
     """
     The Geometric Bridge interpolating function.
@@ -62,9 +78,22 @@ def g_obs_from_g_bar(g_bar, a0=A0):
         g_bar << a0  ->  g_obs  = sqrt(a0*g_bar)  (MOND flat curve)
     Crossover at g_bar = a0, r* = G*M_bar/a0.
     """
-    g_bar = np.asarray(g_bar, dtype=float)
-    g_bar = np.maximum(g_bar, 1e-20)
-    return np.sqrt(g_bar**2 + a0 * g_bar)
+    return _g_obs(_as_f64(g_bar), a0)[()]
+
+
+def _g_obs(g_bar, a0):
+    """g_obs for an ndarray (0-d included), with the 1e-20 floor on g_bar."""
+    return _g_obs_positive(np.maximum(g_bar, 1e-20, out=np.empty_like(g_bar)), a0)
+
+
+def _g_obs_positive(g_bar, a0=A0):
+    """
+    g_obs for an ndarray already known to be >= 0 (no clamping pass), as
+    sqrt(g*(g + a0)) in one output buffer without g^2 / a0*g temporaries.
+    """
+    out = np.add(g_bar, a0, out=np.empty_like(g_bar))
+    np.multiply(out, g_bar, out=out)
+    return np.sqrt(out, out=out)
 
 
 def v_bar_from_components(v_gas, v_disk, v_bul, ml_disk=ML_DISK_DEFAULT, ml_bul=ML_BUL_DEFAULT):
@@ -97,19 +126,26 @@ def v_bar_from_components(v_gas, v_disk, v_bul, ml_disk=ML_DISK_DEFAULT, ml_bul=
     inward-pointing forces (rare but present in some galaxies).
     SPARC convention: V already encodes geometry; squaring gives V^2_circ.
     """
-    v_gas  = np.asarray(v_gas,  dtype=float)
-    v_disk = np.asarray(v_disk, dtype=float)
-    v_bul  = np.asarray(v_bul,  dtype=float)
+    return np.sqrt(_v_bar2(v_gas, v_disk, v_bul, ml_disk, ml_bul))
+
+
+def _v_bar2(v_gas, v_disk, v_bul, ml_disk, ml_bul):
+    """V_bar^2 clipped at zero, so callers need not square sqrt(V_bar^2)."""
+    v_gas  = _as_f64(v_gas)
+    v_disk = _as_f64(v_disk)
+    v_bul  = _as_f64(v_bul)
 
-    v2 = (np.sign(v_gas) * v_gas**2
-          + ml_disk * v_disk**2
-          + ml_bul  * v_bul**2)
-    return np.sqrt(np.maximum(v2, 0.0))
+    # Signed gas term V_gas*|V_gas|, accumulated in place into one buffer
+    shape = np.broadcast_shapes(v_gas.shape, v_disk.shape, v_bul.shape)
+    v2 = np.multiply(v_gas, np.abs(v_gas), out=np.empty(shape))
+    v2 += ml_disk * np.square(v_disk)
+    v2 += ml_bul  * np.square(v_bul)
+    return np.maximum(v2, 0.0, out=v2)
 
 
 def predict_rotation_curve(r, v_gas, v_disk, v_bul,
                             ml_disk=ML_DISK_DEFAULT, ml_bul=ML_BUL_DEFAULT,
-                            a0=A0):
+                            a0=A0, out=None):
     """
     Predict galaxy rotation curve from baryonic mass model.
 
@@ -123,6 +159,10 @@ def predict_rotation_curve(r, v_gas, v_disk, v_bul,
         Stellar mass-to-light ratios.
     a0 : float
         MOND acceleration, (km/s)^2/kpc. Default: 3702.8.
+    out : ndarray, optional
+        C-contiguous float64 array of the broadcast shape to write the
+        result into, so a caller evaluating many curves of one length can
+        reuse a single buffer. It is returned as-is.
 
     Returns
     -------
@@ -139,11 +179,80 @@ def predict_rotation_curve(r, v_gas, v_disk, v_bul,
     >>> v_pred = predict_rotation_curve(r, v_gas, v_dsk, v_bul)
     >>> print(v_pred.round(1))
     """
-    r      = np.asarray(r,     dtype=float)
-    v_bar  = v_bar_from_components(v_gas, v_disk, v_bul, ml_disk, ml_bul)
-    g_bar  = v_bar**2 / np.maximum(r, 1e-6)
-    g_obs  = g_obs_from_g_bar(g_bar, a0)
-    return np.sqrt(np.maximum(g_obs * r, 0.0))
+    r, v_gas, v_disk, v_bul = (_as_f64(a) for a in (r, v_gas, v_disk, v_bul))
+    shape = r.shape
+    if not (r.ndim == 1 and shape == v_gas.shape == v_disk.shape == v_bul.shape):
+        # Scalars, N-d or mixed shapes: broadcast, then run the kernel flat
+        arrs = np.broadcast_arrays(r, v_gas, v_disk, v_bul)
+        shape = arrs[0].shape
+        r, v_gas, v_disk, v_bul = (np.ascontiguousarray(a).ravel() for a in arrs)
+    if out is None:
+        buf = np.empty(r.shape[0])
+    elif (out.shape != shape or out.dtype != np.float64
+          or not out.flags.c_contiguous):
+        raise ValueError(f"out must be a C-contiguous float64 array of shape {shape}")
+    else:
+        buf = out.reshape(-1)   # a view, so the kernel writes straight into out
+    _predict_rc_kernel(r, v_gas, v_disk, v_bul, float(ml_disk), float(ml_bul),
+                       float(a0), buf)
+    return buf.reshape(shape)[()] if out is None else out
+
+
+@njit(fastmath=True, cache=True, inline='always')
+def _v_pred_point(r, vg, vd, vb, ml_d, ml_b, a0):
+    """Geometric-bridge velocity at one radius (signed gas term)."""
+    v2 = max(vg * abs(vg) + ml_d * vd * vd + ml_b * vb * vb, 0.0)
+    g_bar = max(v2 / max(r, 1e-6), 1e-20)
+    g_obs = np.sqrt(g_bar * g_bar + a0 * g_bar)
+    return np.sqrt(max(g_obs * r, 0.0))
+
+
+# Serial on purpose: a single curve is 10-100 radii, far below the size at
+# which spawning a thread team pays off, and the benchmark's batch fit
+# already spreads galaxies over the threads.
+@njit(fastmath=True, nogil=True, cache=True)
+def _predict_rc_kernel(r, v_gas, v_disk, v_bul, ml_d, ml_b, a0, out):
+    for i in range(r.shape[0]):
+        out[i] = _v_pred_point(r[i], v_gas[i], v_disk[i], v_bul[i], ml_d, ml_b, a0)
+    return out
+
+
+@njit(parallel=True, nogil=True, cache=True)
+def _predict_batch_kernel(r, v_gas, v_disk, v_bul, ml_pairs, a0, out):
+    for k in prange(ml_pairs.shape[0]):
+        ml_d = ml_pairs[k, 0]
+        ml_b = ml_pairs[k, 1]
+        for i in range(r.shape[0]):
+            out[k, i] = _v_pred_point(r[i], v_gas[i], v_disk[i], v_bul[i], ml_d, ml_b, a0)
+    return out
+
+
+def predict_rotation_curve_batch(r, v_gas, v_disk, v_bul, ml_pairs, a0=A0):
+    """
+    Predict rotation curves for many M/L pairs in one compiled call.
+
+    Equivalent to calling predict_rotation_curve once per row of
+    `ml_pairs`, without the per-call dispatch and temporaries.
+
+    Parameters
+    ----------
+    r, v_gas, v_disk, v_bul : array_like, shape (N,)
+        As in predict_rotation_curve.
+    ml_pairs : array_like, shape (K, 2)
+        Rows of (ml_disk, ml_bul).
+    a0 : float
+        MOND acceleration, (km/s)^2/kpc. Default: 3702.8.
+
+    Returns
+    -------
+    v_pred : ndarray, shape (K, N)
+        Predicted circular velocity for each M/L pair, km/s.
+    """
+    r        = _as_f64(r)
+    ml_pairs = _as_f64(ml_pairs).reshape(-1, 2)
+    out = np.empty((ml_pairs.shape[0], r.shape[0]))
+    return _predict_batch_kernel(r, _as_f64(v_gas), _as_f64(v_disk), _as_f64(v_bul),
+                                 ml_pairs, float(a0), out)
 
 
 # ── Boost and derived quantities ───────────────────────────────────────────────
@@ -164,10 +273,12 @@ def boost(r, v_gas, v_disk, v_bul, ml_disk=ML_DISK_DEFAULT, ml_bul=ML_BUL_DEFAUL
     -------
     B : ndarray
     """
-    v_b  = v_bar_from_components(v_gas, v_disk, v_bul, ml_disk, ml_bul)
-    gb   = v_b**2 / np.maximum(np.asarray(r, dtype=float), 1e-6)
-    gobs = g_obs_from_g_bar(gb, a0)
-    return np.sqrt(np.maximum(gobs / np.maximum(gb, 1e-20), 1.0))
+    gb   = _v_bar2(v_gas, v_disk, v_bul, ml_disk, ml_bul)
+    gb  /= np.maximum(_as_f64(r), 1e-6)
+    np.maximum(gb, 1e-20, out=gb)    # same g_bar floor as g_obs_from_g_bar
+    gobs = _g_obs_positive(gb, a0)
+    gobs /= gb
+    return np.sqrt(np.maximum(gobs, 1.0, out=gobs), out=gobs)[()]
 
 
 def halo_boundary_radius(v_flat, a0=A0):
@@ -193,7 +304,7 @@ def halo_boundary_radius(v_flat, a0=A0):
     return np.asarray(v_flat, dtype=float)**2 / a0
 
 
-def baryonic_mass_from_btfr(v_flat, a0=A0, G=4.302e-6):
+def baryonic_mass_from_btfr(v_flat, a0=A0, G=G_KPC):
     """
     Baryonic mass from the Tully-Fisher Relation.
 
@@ -217,26 +328,63 @@ def baryonic_mass_from_btfr(v_flat, a0=A0, G=4.302e-6):
     M_bar : float or ndarray
         Baryonic mass, solar masses.
     """
-    v = np.asarray(v_flat, dtype=float)
-    return v**4 / (G * a0)
+    v = _as_f64(v_flat)
+    g_a0 = _G_A0 if (G == G_KPC and a0 == A0) else G * a0
+    return v**4 / g_a0
 
 
 # ── Convenience: rms and R^2 ───────────────────────────────────────────────────
 
 def rms_residual(v_obs, v_pred):
     """Root-mean-square residual, km/s."""
-    return float(np.sqrt(np.mean((np.asarray(v_obs) - np.asarray(v_pred))**2)))
+    d = np.subtract(_as_f64(v_obs), _as_f64(v_pred)).ravel()
+    return float(np.sqrt(d @ d / d.size))
 
 
 def r_squared(v_obs, v_pred):
     """Coefficient of determination R^2."""
-    v_obs = np.asarray(v_obs, dtype=float)
-    v_pred = np.asarray(v_pred, dtype=float)
-    ss_res = np.sum((v_obs - v_pred)**2)
-    ss_tot = np.sum((v_obs - np.mean(v_obs))**2)
+    v_obs = _as_f64(v_obs).ravel()
+    d = v_obs - _as_f64(v_pred).ravel()
+    ss_res = d @ d
+    np.subtract(v_obs, v_obs.mean(), out=d)
+    ss_tot = d @ d
     return float(1 - ss_res / ss_tot) if ss_tot > 0 else np.nan
 
 
+@njit(fastmath=True, nogil=True, cache=True)
+def _fit_metrics_kernel(v_obs, v_pred):
+    n = v_obs.shape[0]
+    if n == 0:
+        return np.nan, np.nan   # as rms_residual / r_squared on empty input
+    mean = 0.0
+    ss_tot = 0.0
+    ss_res = 0.0
+    for i in range(n):
+        v = v_obs[i]
+        d = v - v_pred[i]
+        ss_res += d * d
+        delta = v - mean
+        mean += delta / (i + 1)
+        ss_tot += delta * (v - mean)
+    r2 = 1.0 - ss_res / ss_tot if ss_tot > 0 else np.nan
+    return np.sqrt(ss_res / n), r2
+
+
+def fit_metrics(v_obs, v_pred):
+    """
+    rms_residual and r_squared together, in one pass over the data.
+
+    Returns
+    -------
+    rms : float
+        Root-mean-square residual, km/s.
+    r2 : float
+        Coefficient of determination (NaN when V_obs is constant).
+    """
+    rms, r2 = _fit_metrics_kernel(_as_f64(v_obs), _as_f64(v_pred))
+    return float(rms), float(r2)
+
+
 # ── Self-test ──────────────────────────────────────────────────────────────────
 
 def _self_test():
@@ -257,21 +405,31 @@ def _self_test():
     assert np.allclose(ratio_low, 1.0, rtol=0.05), f"MOND limit failed: {ratio_low}"
 
     # Crossover: g_bar = a0 -> g_obs = sqrt(a0^2 + a0^2) = a0*sqrt(2)
-    g_cross = g_obs_from_g_bar(np.array([a0]))
-    assert np.isclose(g_cross[0], a0 * np.sqrt(2), rtol=1e-6), f"Crossover failed: {g_cross}"
+    g_cross = g_obs_from_g_bar(a0)
+    assert np.isclose(g_cross, a0 * _SQRT2, rtol=1e-6), f"Crossover failed: {g_cross}"
+
+    # Compiled predict_rotation_curve agrees with the NumPy composition
+    # (this call also loads/compiles the kernel cache)
+    r     = np.array([0.5, 1.0, 2.0, 5.0, 10.0, 20.0])
+    v_gas = np.array([-2.0, 5.0, 8.0, 15.0, 18.0, 16.0])
+    v_dsk = np.array([20.0, 30.0, 40.0, 45.0, 40.0, 30.0])
+    v_bul = np.array([40.0, 20.0, 10.0, 0.0, 0.0, 0.0])
+    v_pred = predict_rotation_curve(r, v_gas, v_dsk, v_bul)
+    g_bar  = v_bar_from_components(v_gas, v_dsk, v_bul)**2 / r
+    v_ref  = np.sqrt(g_obs_from_g_bar(g_bar) * r)
+    assert np.allclose(v_pred, v_ref, rtol=1e-12), f"Kernel mismatch: {v_pred} vs {v_ref}"
 
     # BTFR: M_Newton at r_halo = M_bar
     v_flat = 150.0  # km/s
     r_halo = halo_boundary_radius(v_flat)
-    G = 4.302e-6
-    m_newton = v_flat**2 * r_halo / G
+    m_newton = v_flat**2 * r_halo / G_KPC
     m_btfr   = baryonic_mass_from_btfr(v_flat)
     assert np.isclose(m_newton, m_btfr, rtol=1e-6), f"BTFR identity failed: {m_newton} vs {m_btfr}"
 
     print("All self-tests passed:")
     print(f"  Newton limit:   g_obs/g_bar = {ratio_high.mean():.6f}  (expect 1.0)")
     print(f"  MOND limit:     g_obs/g_mond = {ratio_low.mean():.4f}  (expect 1.0)")
-    print(f"  Crossover:      g_obs/a0 = {g_cross[0]/a0:.6f}  (expect sqrt(2) = {np.sqrt(2):.6f})")
+    print(f"  Crossover:      g_obs/a0 = {g_cross/a0:.6f}  (expect sqrt(2) = {_SQRT2:.6f})")
     print(f"  BTFR identity:  M_Newton = M_bar = {m_btfr:.3e} M_sun")
 
 
@@ -9,10 +9,23 @@ Author: Gezwil Percy
 Date: February 2026
 """
 
+import os
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # file output only; no GUI backend
 import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
 import pandas as pd
 
+# Agg path chunking + simplification (same settings as framework_comparison)
+plt.rcParams.update({'agg.path.chunksize': 10000,
+                     'path.simplify': True,
+                     'path.simplify_threshold': 1.0})
+
+# PLOT_DPI / PLOT_TIGHT environment overrides, as in framework_comparison
+PLOT_DPI = int(os.environ.get('PLOT_DPI', '150'))
+PLOT_TIGHT = os.environ.get('PLOT_TIGHT', '0') == '1'
+
 print("="*80)
 print("INDEPENDENT VALIDATION TEST")
 print("LITTLE THINGS + GHASP Samples")
@@ -28,58 +41,64 @@ print("="*80)
 print("TEST 1: LITTLE THINGS SAMPLE (Dwarf Galaxies)")
 print("="*80)
 
-little_things_data = {
-    'Galaxy': ['DDO 154', 'DDO 168', 'CVnIdwA', 'DDO 52', 'DDO 70'],
-    'Distance_Mpc': [3.7, 4.3, 3.6, 10.3, 1.3],
-    'log_MHI': [8.46, 8.47, 7.67, 8.43, 7.61],  # log(M_HI/M_sun)
-    'R_max_kpc': [1.14, 1.15, 0.57, 1.30, 0.48],
-    'Regime': ['Low Density', 'Low Density', 'Ultra-Low', 'Low Density', 'Low Density'],
-    'Observed_RC': ['Rising', 'Rising', 'Rising', 'Rising', 'Rising']
-}
-
-df_lt = pd.DataFrame(little_things_data)
+# Numeric columns as float64 arrays up front: no per-column dtype inference
+# on the lists, and the derived masses are plain array math
+lt_log_MHI = np.array([8.46, 8.47, 7.67, 8.43, 7.61])  # log(M_HI/M_sun)
+lt_R_max = np.array([1.14, 1.15, 0.57, 1.30, 0.48])
 
 # Calculate total baryonic mass
 # For dwarfs: M_bar ≈ M_HI (HI dominates, assume M_stars ≈ 0.3 × M_HI)
-df_lt['M_HI'] = 10**df_lt['log_MHI']
-df_lt['M_stars_est'] = 0.3 * df_lt['M_HI']  # Rough estimate
-df_lt['M_bar'] = df_lt['M_HI'] + df_lt['M_stars_est']
+lt_M_HI = 10**lt_log_MHI
+lt_M_stars = 0.3 * lt_M_HI  # Rough estimate
+lt_M_bar = lt_M_HI + lt_M_stars
 
 # Calculate surface density Σ = M_bar / (π R_max²)
 # M in M_sun, R in kpc → need Σ in M_sun/pc²
 # Σ = M_bar / (R_max_kpc × 1000)² × (1/π) × 1e6
 # Simplified: Σ = M_bar / R_max² / π / 1e6 M_sun/pc²
-df_lt['Sigma'] = df_lt['M_bar'] / (np.pi * (df_lt['R_max_kpc'] * 1000)**2)
+lt_Sigma = lt_M_bar / (np.pi * (lt_R_max * 1000)**2)
+
+df_lt = pd.DataFrame({
+    'Galaxy': ['DDO 154', 'DDO 168', 'CVnIdwA', 'DDO 52', 'DDO 70'],
+    'Distance_Mpc': np.array([3.7, 4.3, 3.6, 10.3, 1.3]),
+    'log_MHI': lt_log_MHI,
+    'R_max_kpc': lt_R_max,
+    'Regime': ['Low Density', 'Low Density', 'Ultra-Low', 'Low Density', 'Low Density'],
+    'Observed_RC': ['Rising', 'Rising', 'Rising', 'Rising', 'Rising'],
+    'M_HI': lt_M_HI,
+    'M_stars_est': lt_M_stars,
+    'M_bar': lt_M_bar,
+    'Sigma': lt_Sigma,
+    'log_Sigma': np.log10(lt_Sigma),
+})
 
 # Percy's formula
-def percy_formula(Sigma):
-    return 1.972 - 0.487 * np.log10(Sigma)
+def percy_formula(log_sigma):
+    """α from log10(Σ); callers keep log10(Σ) in a log_Sigma column"""
+    return 1.972 - 0.487 * log_sigma
 
-df_lt['alpha_predicted'] = percy_formula(df_lt['Sigma'])
+df_lt['alpha_predicted'] = percy_formula(df_lt['log_Sigma'].values)
 
 # Classify expected behavior
+CURVES = np.array(['Falling (Keplerian)', 'Flat/Falling', 'Flat/Rising', 'Rising (Strong DM)'])
+
 def classify_curve(alpha):
-    if alpha > 1.5:
-        return 'Rising (Strong DM)'
-    elif alpha > 1.0:
-        return 'Flat/Rising'
-    elif alpha > 0.5:
-        return 'Flat/Falling'
-    else:
-        return 'Falling (Keplerian)'
-
-df_lt['Predicted_RC'] = df_lt['alpha_predicted'].apply(classify_curve)
+    """Curve label(s) for α: <= 0.5, 0.5-1.0, 1.0-1.5, > 1.5"""
+    return CURVES[np.digitize(alpha, [0.5, 1.0, 1.5], right=True)]
+
+df_lt['Predicted_RC'] = classify_curve(df_lt['alpha_predicted'].values)
 df_lt['Match'] = df_lt['Predicted_RC'].str.contains('Rising')
 
+def print_results(df):
+    """Per-galaxy prediction table, formatted in one to_string pass"""
+    table = df[['Galaxy', 'Sigma', 'alpha_predicted', 'Predicted_RC', 'Observed_RC']].copy()
+    table['Match'] = np.where(df['Match'], '✓', '✗')
+    table.columns = ['Galaxy', 'Σ (M☉/pc²)', 'α_pred', 'Predicted', 'Observed', 'Match']
+    print(table.to_string(index=False, float_format=lambda x: f'{x:.2f}'))
+
 print("\nLITTLE THINGS Results:")
 print("-"*80)
-print(f"{'Galaxy':<12} {'Σ (M☉/pc²)':<15} {'α_pred':<10} {'Predicted':<20} {'Observed':<15} {'Match'}")
-print("-"*80)
-
-for idx, row in df_lt.iterrows():
-    match_str = "✓" if row['Match'] else "✗"
-    print(f"{row['Galaxy']:<12} {row['Sigma']:>14.2f} {row['alpha_predicted']:>9.2f} "
-          f"{row['Predicted_RC']:<20} {row['Observed_RC']:<15} {match_str}")
+print_results(df_lt)
 
 lt_accuracy = df_lt['Match'].sum() / len(df_lt) * 100
 print(f"\nAccuracy: {df_lt['Match'].sum()}/{len(df_lt)} = {lt_accuracy:.0f}%")
@@ -92,47 +111,43 @@ print("\n" + "="*80)
 print("TEST 2: GHASP SAMPLE (Independent Spirals)")
 print("="*80)
 
-ghasp_data = {
-    'Galaxy': ['UGC 10143', 'UGC 3382', 'UGC 11300'],
-    'Type': ['Spiral', 'Spiral', 'Dwarf'],
-    'M_bar': [1.02e11, 2.45e10, 4.1e8],  # M_sun
-    'R_max_kpc': [11.8, 14.2, 2.4],
-    'Observed_RC': ['Falling/Flat', 'Flat', 'Rising/Flat']
-}
-
-df_ghasp = pd.DataFrame(ghasp_data)
+ghasp_M_bar = np.array([1.02e11, 2.45e10, 4.1e8])  # M_sun
+ghasp_R_max = np.array([11.8, 14.2, 2.4])
 
 # Calculate surface density
-df_ghasp['Sigma'] = df_ghasp['M_bar'] / (np.pi * (df_ghasp['R_max_kpc'] * 1000)**2)
+ghasp_Sigma = ghasp_M_bar / (np.pi * (ghasp_R_max * 1000)**2)
+
+df_ghasp = pd.DataFrame({
+    'Galaxy': ['UGC 10143', 'UGC 3382', 'UGC 11300'],
+    'Type': ['Spiral', 'Spiral', 'Dwarf'],
+    'M_bar': ghasp_M_bar,
+    'R_max_kpc': ghasp_R_max,
+    'Observed_RC': ['Falling/Flat', 'Flat', 'Rising/Flat'],
+    'Sigma': ghasp_Sigma,
+    'log_Sigma': np.log10(ghasp_Sigma),
+})
 
 # Predict alpha
-df_ghasp['alpha_predicted'] = percy_formula(df_ghasp['Sigma'])
-df_ghasp['Predicted_RC'] = df_ghasp['alpha_predicted'].apply(classify_curve)
+df_ghasp['alpha_predicted'] = percy_formula(df_ghasp['log_Sigma'].values)
+df_ghasp['Predicted_RC'] = classify_curve(df_ghasp['alpha_predicted'].values)
 
 # Check matches
-def check_ghasp_match(row):
-    obs = row['Observed_RC'].lower()
-    pred = row['Predicted_RC'].lower()
-    
-    if 'falling' in obs and ('falling' in pred or alpha < 0.7):
-        return True
-    if 'flat' in obs and 0.7 < row['alpha_predicted'] < 1.3:
-        return True
-    if 'rising' in obs and 'rising' in pred:
-        return True
-    return False
+def check_ghasp_match(df):
+    """Boolean mask: observed curve shape consistent with the prediction"""
+    obs = df['Observed_RC'].str.lower()
+    pred = df['Predicted_RC'].str.lower()
+    alpha = df['alpha_predicted']
+
+    falling = obs.str.contains('falling') & (pred.str.contains('falling') | (alpha < 0.7))
+    flat = obs.str.contains('flat') & (alpha > 0.7) & (alpha < 1.3)
+    rising = obs.str.contains('rising') & pred.str.contains('rising')
+    return (falling | flat | rising).values
 
-df_ghasp['Match'] = df_ghasp.apply(check_ghasp_match, axis=1)
+df_ghasp['Match'] = check_ghasp_match(df_ghasp)
 
 print("\nGHASP Results:")
 print("-"*80)
-print(f"{'Galaxy':<12} {'Σ (M☉/pc²)':<15} {'α_pred':<10} {'Predicted':<20} {'Observed':<15} {'Match'}")
-print("-"*80)
-
-for idx, row in df_ghasp.iterrows():
-    match_str = "✓" if row['Match'] else "✗"
-    print(f"{row['Galaxy']:<12} {row['Sigma']:>14.2f} {row['alpha_predicted']:>9.2f} "
-          f"{row['Predicted_RC']:<20} {row['Observed_RC']:<15} {match_str}")
+print_results(df_ghasp)
 
 ghasp_accuracy = df_ghasp['Match'].sum() / len(df_ghasp) * 100
 print(f"\nAccuracy: {df_ghasp['Match'].sum()}/{len(df_ghasp)} = {ghasp_accuracy:.0f}%")
@@ -169,29 +184,42 @@ print("\n" + "="*80)
 print("REGIME VALIDATION")
 print("="*80)
 
-# Combine datasets
-df_combined = pd.concat([
-    df_lt[['Galaxy', 'Sigma', 'alpha_predicted', 'Observed_RC']],
-    df_ghasp[['Galaxy', 'Sigma', 'alpha_predicted', 'Observed_RC']]
-], ignore_index=True)
-
-def classify_regime(sigma):
-    if sigma < 1.0:
-        return 'Enhanced (Σ < 1)'
-    elif sigma < 10:
-        return 'Enhanced (Σ < 10)'
-    elif sigma < 100:
-        return 'Active (10-100)'
-    else:
-        return 'Newtonian (> 100)'
-
-df_combined['Regime'] = df_combined['Sigma'].apply(classify_regime)
+REGIMES = np.array(['Enhanced (Σ < 1)', 'Enhanced (Σ < 10)', 'Active (10-100)', 'Newtonian (> 100)'])
+
+def regime_code(sigma):
+    """Index into REGIMES for Σ: < 1, 1-10, 10-100, >= 100 M☉/pc²"""
+    return np.digitize(sigma, [1.0, 10, 100])
+
+# Combine datasets: concatenate the columns once, then build the frame
+combined_cols = ['Galaxy', 'Sigma', 'alpha_predicted', 'Observed_RC']
+combined = {c: np.concatenate([df_lt[c].values, df_ghasp[c].values]) for c in combined_cols}
+code = regime_code(combined['Sigma'])
+combined['Regime'] = REGIMES[code]
+df_combined = pd.DataFrame(combined)
+
+# Per-regime stats from the integer codes: bincount for count/mean/std,
+# reduceat over a code-sorted copy for min/max
+count = np.bincount(code, minlength=len(REGIMES))
+present = count > 0
+n = count[present]
+row = (np.cumsum(present) - 1)[code]   # row among the regimes present
+sigma, alpha = combined['Sigma'], combined['alpha_predicted']
+order = np.argsort(code, kind='stable')
+starts = np.concatenate([[0], np.cumsum(n)[:-1]])
+alpha_mean = np.bincount(row, weights=alpha) / n
+with np.errstate(invalid='ignore', divide='ignore'):
+    alpha_std = np.sqrt(np.bincount(row, weights=(alpha - alpha_mean[row])**2) / (n - 1))
+regime_stats = pd.DataFrame({
+    'count': n,
+    'Σ mean': np.bincount(row, weights=sigma) / n,
+    'Σ min': np.minimum.reduceat(sigma[order], starts),
+    'Σ max': np.maximum.reduceat(sigma[order], starts),
+    'α mean': alpha_mean,
+    'α std': np.where(n > 1, alpha_std, np.nan),
+}, index=pd.Index(REGIMES[present], name='Regime'))
 
 print("\nSurface Density Ranges:")
-print(df_combined.groupby('Regime').agg({
-    'Sigma': ['count', 'mean', 'min', 'max'],
-    'alpha_predicted': ['mean', 'std']
-}))
+print(regime_stats.to_string())
 
 # ============================================================================
 # VISUALIZATION
@@ -207,19 +235,18 @@ fig, axes = plt.subplots(1, 2, figsize=(14, 6))
 ax = axes[0]
 
 # Plot LITTLE THINGS
-ax.scatter(np.log10(df_lt['Sigma']), df_lt['alpha_predicted'], 
+ax.scatter(df_lt['log_Sigma'].values, df_lt['alpha_predicted'].values, 
           s=150, marker='^', color='red', alpha=0.7, edgecolor='black', linewidth=2,
-          label='LITTLE THINGS (dwarfs)', zorder=3)
+          label='LITTLE THINGS (dwarfs)', zorder=3, rasterized=True)
 
 # Plot GHASP
-ax.scatter(np.log10(df_ghasp['Sigma']), df_ghasp['alpha_predicted'],
+ax.scatter(df_ghasp['log_Sigma'].values, df_ghasp['alpha_predicted'].values,
           s=150, marker='s', color='blue', alpha=0.7, edgecolor='black', linewidth=2,
-          label='GHASP (spirals)', zorder=3)
+          label='GHASP (spirals)', zorder=3, rasterized=True)
 
 # Percy's formula line
 x_theory = np.linspace(-1, 3, 100)
-Sigma_theory = 10**x_theory
-y_theory = percy_formula(Sigma_theory)
+y_theory = percy_formula(x_theory)
 ax.plot(x_theory, y_theory, 'k--', linewidth=3, label='Percy Formula', zorder=2)
 
 # Regime boundaries
@@ -239,35 +266,41 @@ ax = axes[1]
 colors = {'Rising': 'red', 'Rising/Flat': 'orange', 'Flat': 'blue', 
           'Flat/Falling': 'green', 'Falling/Flat': 'cyan', 'Falling (Keplerian)': 'purple'}
 
+# One scatter per survey (marker differs), coloured per point; proxy
+# markers give one legend entry per (survey, observed curve) pair
+rc_handles = []
 for dataset, marker, label in [(df_lt, '^', 'LITTLE THINGS'), (df_ghasp, 's', 'GHASP')]:
-    for rc_type in dataset['Observed_RC'].unique():
-        mask = dataset['Observed_RC'] == rc_type
-        if mask.sum() > 0:
-            ax.scatter(dataset[mask]['Sigma'], dataset[mask]['alpha_predicted'],
-                      s=150, marker=marker, alpha=0.7, edgecolor='black', linewidth=2,
-                      color=colors.get(rc_type, 'gray'),
-                      label=f'{label}: {rc_type}')
+    ax.scatter(dataset['Sigma'].values, dataset['alpha_predicted'].values,
+              s=150, marker=marker, alpha=0.7, edgecolor='black', linewidth=2,
+              color=[colors.get(rc, 'gray') for rc in dataset['Observed_RC']],
+              rasterized=True)
+    rc_handles += [Line2D([], [], linestyle='', marker=marker, markersize=12, alpha=0.7,
+                          markerfacecolor=colors.get(rc_type, 'gray'),
+                          markeredgecolor='black', markeredgewidth=2,
+                          label=f'{label}: {rc_type}')
+                   for rc_type in dataset['Observed_RC'].unique()]
 
 ax.set_xscale('log')
 ax.set_xlabel('Σ [M☉/pc²] (log scale)', fontsize=12, fontweight='bold')
 ax.set_ylabel('α (Predicted)', fontsize=12, fontweight='bold')
 ax.set_title(f'Predictions vs Observations\nAccuracy: {total_accuracy:.0f}%', 
             fontsize=12, fontweight='bold')
-ax.legend(fontsize=8, loc='best', ncol=2)
+ax.legend(handles=rc_handles, fontsize=8, loc='best', ncol=2)
 ax.grid(True, alpha=0.3)
 
-# Add regime labels
+# Add regime labels (x in data units, y near the top of the axes)
 ax.axvline(x=1, color='gray', linestyle='--', alpha=0.3)
 ax.axvline(x=10, color='gray', linestyle='--', alpha=0.3)
 ax.axvline(x=100, color='gray', linestyle='--', alpha=0.3)
 
-ax.text(0.3, 1.9, 'Ultra-Low', fontsize=9, alpha=0.5, fontweight='bold')
-ax.text(3, 1.9, 'Enhanced', fontsize=9, alpha=0.5, fontweight='bold')
-ax.text(30, 1.9, 'Active', fontsize=9, alpha=0.5, fontweight='bold')
-ax.text(150, 1.9, 'Newtonian', fontsize=9, alpha=0.5, fontweight='bold')
+ax.text(0.3, 0.95, 'Ultra-Low', fontsize=9, alpha=0.5, fontweight='bold', transform=ax.get_xaxis_transform())
+ax.text(3, 0.95, 'Enhanced', fontsize=9, alpha=0.5, fontweight='bold', transform=ax.get_xaxis_transform())
+ax.text(30, 0.95, 'Active', fontsize=9, alpha=0.5, fontweight='bold', transform=ax.get_xaxis_transform())
+ax.text(150, 0.95, 'Newtonian', fontsize=9, alpha=0.5, fontweight='bold', transform=ax.get_xaxis_transform())
 
 plt.tight_layout()
-plt.savefig('/home/claude/independent_validation.png', dpi=300, bbox_inches='tight')
+plt.savefig('/home/claude/independent_validation.png', dpi=PLOT_DPI,
+            bbox_inches='tight' if PLOT_TIGHT else None)
 print("✓ Plot saved: independent_validation.png")
 
 # ============================================================================
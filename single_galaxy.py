@@ -9,25 +9,81 @@ Usage
     python examples/single_galaxy.py data/MassModels_Lelli2016c.txt DDO154 --fixed
 """
 
+import os
 import sys
+import math
 import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.rcParams.update({'figure.facecolor': '#030308', 'axes.facecolor': '#080812',
-                            'text.color': 'white', 'axes.labelcolor': 'white',
-                            'xtick.color': 'white', 'ytick.color': 'white'})
+from numba import njit
+
+# Dark theme, applied when plot_galaxy first imports matplotlib
+_STYLE = {'figure.facecolor': '#030308', 'axes.facecolor': '#080812',
+          'text.color': 'white', 'axes.labelcolor': 'white',
+          'xtick.color': 'white', 'ytick.color': 'white'}
+_MPL_READY = False
+
+# Per-process state for plot_all workers: the frame and a reused figure
+_WORKER = {}
 
 # Allow running from repo root
 sys.path.insert(0, str(__import__('pathlib').Path(__file__).parent.parent))
 
-from src.sparc_loader import load_sparc, get_galaxy, HUBBLE_TYPE, MORPHOLOGY_LABEL
-from src.geometric_bridge import (predict_rotation_curve, g_obs_from_g_bar,
-                                   halo_boundary_radius, A0)
+from src.sparc_loader import (load_sparc, get_galaxy, galaxy_list, HUBBLE_TYPE,
+                              MORPHOLOGY_LABEL)
+from src.geometric_bridge import (predict_rotation_curve, halo_boundary_radius,
+                                   fit_metrics, A0)
 from src.fitting import fit_ml
 
 
-def plot_galaxy(df, galaxy_name, fixed_ml=False, save=None):
+@njit(fastmath=True, nogil=True, cache=True)
+def _galaxy_kernel(r, vob, vg, vd, vb, ml_d, ml_b, a0):
+    """
+    Newtonian V_bar, predicted boost and observed boost in one pass:
+    vn = sqrt(max(vg,0)^2 + ml_d vd^2 + ml_b vb^2), gb = vn^2/r,
+    boost = sqrt(g_obs(gb)/gb), boost_obs = vob/max(vn,0.01).
+    Expects r > 0 (get_galaxy's cut), so r is not clamped.
+    """
+    n = r.shape[0]
+    vn = np.empty(n)
+    boost = np.empty(n)
+    boost_obs = np.empty(n)
+    for i in range(n):
+        vgp = max(vg[i], 0.0)
+        vn2 = vgp * vgp + ml_d * vd[i] * vd[i] + ml_b * vb[i] * vb[i]
+        vn[i] = math.sqrt(vn2)
+        gb = max(vn2 / r[i], 1e-20)
+        boost[i] = math.sqrt(math.sqrt(gb * (gb + a0)) / gb)
+        boost_obs[i] = vob[i] / max(vn[i], 0.01)
+    return vn, boost, boost_obs
+
+
+def _pyplot():
+    """
+    Import pyplot on first use, so loading this module (e.g. for
+    _galaxy_kernel or in a sweep) doesn't pay the matplotlib import.
+    """
+    global _MPL_READY
+    import matplotlib
+    import matplotlib.pyplot as plt
+    if not _MPL_READY:
+        matplotlib.rcParams.update(_STYLE)
+        _MPL_READY = True
+    return plt
+
+
+def plot_galaxy(df, galaxy_name, fixed_ml=False, save=None, fig=None, plot=True):
+    """
+    Fit (or fix) M/L for one galaxy, print a summary and draw its rotation
+    curve and boost profile.
+
+    Pass the figure returned by a previous call as `fig` to redraw into it
+    instead of building a new one, e.g. when saving many galaxies. With
+    plot=False only the summary is printed and matplotlib is never touched.
+    Returns the figure (None if not plotted or too few points).
+    """
     sub = get_galaxy(df, galaxy_name)
     if len(sub) < 3:
         print(f"Not enough data for {galaxy_name}")
@@ -51,29 +107,50 @@ def plot_galaxy(df, galaxy_name, fixed_ml=False, save=None):
         ml_b = result['ml_bul']
         label_ml = f'M/L_disk={ml_d:.2f}, M/L_bul={ml_b:.2f} (fitted)'
 
-    vn   = np.sqrt(np.maximum(vg, 0)**2 + ml_d*vd**2 + ml_b*vb**2)
     vpred = predict_rotation_curve(r, vg, vd, vb, ml_d, ml_b)
 
-    rms   = float(np.sqrt(np.mean((vob - vpred)**2)))
-    ss_res = float(np.sum((vob-vpred)**2))
-    ss_tot = float(np.sum((vob-np.mean(vob))**2))
-    r2 = 1 - ss_res/ss_tot if ss_tot > 0 else float('nan')
+    if fixed_ml:
+        rms, r2 = fit_metrics(vob, vpred)   # one fused pass
+    else:
+        rms, r2 = result['rms'], result['r2']   # fit_ml scored this same curve
 
     v_flat  = float(np.mean(vob[-3:]))
     r_halo  = float(halo_boundary_radius(v_flat))
 
-    # Plot
-    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
-    fig.patch.set_facecolor('#030308')
+    print(f"\n{galaxy_name} ({morph})")
+    print(f"  N points:    {len(r)}")
+    print(f"  {label_ml}")
+    print(f"  rms:         {rms:.2f} km/s")
+    print(f"  R²:          {r2:.4f}")
+    print(f"  V_flat:      {v_flat:.1f} km/s")
+    print(f"  r_halo:      {r_halo:.1f} kpc  (disk extends to {r[-1]:.1f} kpc)")
+    print(f"  r_halo/r_max: {r_halo/r[-1]:.2f}")
+
+    if not plot:
+        return None
+
+    # Plot. _galaxy_kernel doesn't clamp r; sub is sorted by r, so r[0] bounds it
+    if r[0] <= 0:
+        raise ValueError(f"{galaxy_name}: radii must be positive, got r = {r[0]}")
+    vn, boost_vals, boost_obs = _galaxy_kernel(r, vob, vg, vd, vb,
+                                               float(ml_d), float(ml_b), A0)
+    plt = _pyplot()
+    if fig is None:
+        fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+        fig.patch.set_facecolor('#030308')
+    else:
+        axes = fig.axes
+        for a in axes:
+            a.clear()
 
     # Left: rotation curve
     ax = axes[0]
     ax.set_facecolor('#080812')
     ax.errorbar(r, vob, yerr=ev, fmt='o', color='white', ms=5,
-                elinewidth=0.9, capsize=2, label='$V_{obs}$', zorder=5)
-    ax.plot(r, vn,    '--', color='#556677', lw=1.8, label='Newton ($V_{bar}$)')
+                elinewidth=0.9, capsize=2, label='$V_{obs}$', zorder=5, rasterized=True)
+    ax.plot(r, vn,    '--', color='#556677', lw=1.8, label='Newton ($V_{bar}$)', rasterized=True)
     ax.plot(r, vpred, '-',  color='#00ffcc', lw=2.5,
-            label=f'Geometric bridge ({rms:.1f} km/s)')
+            label=f'Geometric bridge ({rms:.1f} km/s)', rasterized=True)
     if r_halo < r[-1] * 5:
         ax.axvline(r_halo, color='#ff9922', lw=1.5, ls=':', alpha=0.8,
                    label=f'$r_{{halo}}$ = {r_halo:.0f} kpc')
@@ -88,12 +165,9 @@ def plot_galaxy(df, galaxy_name, fixed_ml=False, save=None):
     # Right: Boost profile
     ax2 = axes[1]
     ax2.set_facecolor('#080812')
-    gb = vn**2 / np.maximum(r, 0.001)
-    boost_vals = np.sqrt(g_obs_from_g_bar(gb) / np.maximum(gb, 1e-20))
-    boost_obs  = vob / np.maximum(vn, 0.01)
-
-    ax2.scatter(r, boost_obs, color='white', s=20, zorder=5, label='$V_{obs}/V_{bar}$ (observed)')
-    ax2.plot(r, boost_vals,   color='#00ffcc', lw=2.5, label='Formula prediction')
+    ax2.scatter(r, boost_obs, color='white', s=20, zorder=5, label='$V_{obs}/V_{bar}$ (observed)',
+                rasterized=True)
+    ax2.plot(r, boost_vals,   color='#00ffcc', lw=2.5, label='Formula prediction', rasterized=True)
     ax2.axhline(1.0, color='#556677', lw=1.5, ls='--', label='Newton (Boost=1)')
     ax2.axvline(r_halo if r_halo < r[-1]*5 else r[-1]*2,
                 color='#ff9922', lw=1.5, ls=':', alpha=0.8)
@@ -104,22 +178,79 @@ def plot_galaxy(df, galaxy_name, fixed_ml=False, save=None):
     ax2.legend(fontsize=9, facecolor='#111', labelcolor='white')
     [sp.set_color('#1a1a2a') for sp in ax2.spines.values()]
 
-    plt.tight_layout()
-
-    print(f"\n{galaxy_name} ({morph})")
-    print(f"  N points:    {len(r)}")
-    print(f"  {label_ml}")
-    print(f"  rms:         {rms:.2f} km/s")
-    print(f"  R²:          {r2:.4f}")
-    print(f"  V_flat:      {v_flat:.1f} km/s")
-    print(f"  r_halo:      {r_halo:.1f} kpc  (disk extends to {r[-1]:.1f} kpc)")
-    print(f"  r_halo/r_max: {r_halo/r[-1]:.2f}")
+    fig.tight_layout()
 
     if save:
-        plt.savefig(save, dpi=200, bbox_inches='tight', facecolor='#030308')
+        fig.savefig(save, dpi=150, bbox_inches='tight', facecolor='#030308')
         print(f"  Saved to: {save}")
     else:
         plt.show()
+    return fig
+
+
+def _agg_figure():
+    """
+    plot_galaxy's two-panel figure on its own Agg canvas, outside pyplot's
+    figure manager: PNG output without switching anyone's backend.
+    """
+    _pyplot()   # style rcParams before the figure picks up its defaults
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=(14, 6))
+    FigureCanvasAgg(fig)
+    fig.subplots(1, 2)
+    fig.patch.set_facecolor('#030308')
+    return fig
+
+
+def _init_plot_worker(df):
+    """
+    plot_all worker initializer: the frame, sent once per worker instead
+    of once per galaxy, and an Agg figure to redraw into.
+    """
+    _WORKER['df'] = df
+    _WORKER['fig'] = _agg_figure()
+
+
+def _plot_one(name, fixed_ml, path):
+    """Save one galaxy's figure from a plot_all worker; path or None."""
+    fig = plot_galaxy(_WORKER['df'], name, fixed_ml=fixed_ml, save=path,
+                      fig=_WORKER['fig'])
+    return None if fig is None else path   # None: too few points
+
+
+def plot_all(df, outdir, names=None, fixed_ml=False, workers=None):
+    """
+    Save <outdir>/<galaxy>.png for each galaxy in `names` (default: all).
+
+    Galaxies are rendered in `workers` processes (default os.cpu_count();
+    1 draws in this process), each redrawing into one figure on its own
+    Agg canvas, so the pyplot backend is left alone. Returns the paths
+    written.
+    """
+    outdir = Path(outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+    names = galaxy_list(df) if names is None else list(names)
+    paths = [str(outdir / f'{name}.png') for name in names]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        fig = _agg_figure()
+        try:
+            done = [plot_galaxy(df, name, fixed_ml=fixed_ml, save=path, fig=fig)
+                    for name, path in zip(names, paths)]
+        finally:
+            _pyplot().close(fig)
+        return [path for path, f in zip(paths, done) if f is not None]
+
+    # Not fork: once fit_ml's parallel kernel has started Numba's TBB pool
+    # in this process, forked workers hang on exit. Start them clean.
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_plot_worker, initargs=(df,)) as ex:
+        done = ex.map(_plot_one, names, [fixed_ml] * len(names), paths, chunksize=4)
+        return [path for path in done if path is not None]
 
 
 if __name__ == '__main__':
@@ -128,7 +259,13 @@ if __name__ == '__main__':
     parser.add_argument('galaxy', help='Galaxy name (e.g. NGC3198)')
     parser.add_argument('--fixed', action='store_true', help='Use fixed M/L=0.5')
     parser.add_argument('--save', default=None, help='Save figure to file')
+    parser.add_argument('--no-plot', action='store_true', help='Print the summary only')
     args = parser.parse_args()
 
+    if args.save:
+        import matplotlib
+        matplotlib.use('Agg')   # file output only; skip GUI backend start-up
+
     df = load_sparc(args.sparc_file)
-    plot_galaxy(df, args.galaxy, fixed_ml=args.fixed, save=args.save)
+    plot_galaxy(df, args.galaxy, fixed_ml=args.fixed, save=args.save,
+                plot=not args.no_plot)
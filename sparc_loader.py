@@ -11,15 +11,25 @@ File format: MassModels_Lelli2016c.txt
 Columns: Galaxy, Dist, r, V_obs, e_Vobs, V_gas, V_disk, V_bul, SB_disk, SB_bul
 """
 
+from functools import lru_cache
 import numpy as np
 import pandas as pd
 from pathlib import Path
 
+try:
+    import pyarrow  # noqa: F401  Parquet engine for the parsed-file cache
+    _HAVE_PARQUET = True
+except ImportError:  # optional; without it every load re-parses the text
+    _HAVE_PARQUET = False
+
 
 SPARC_COLUMNS = [
     'Galaxy', 'Dist', 'r', 'V_obs', 'eV', 'V_gas', 'V_disk', 'V_bul', 'SB_disk', 'SB_bul'
 ]
 
+# Columns kept by load_sparc (Dist is not used downstream)
+_NUMERIC_COLUMNS = ['r', 'V_obs', 'eV', 'V_gas', 'V_disk', 'V_bul', 'SB_disk', 'SB_bul']
+
 # Hubble type T for each SPARC galaxy
 # T: 0=S0, 1=Sa, 2=Sab, 3=Sb, 4=Sbc, 5=Sc, 6=Scd, 7=Sd, 8=Sdm, 9=Sm, 10=Im, 11=BCD
 HUBBLE_TYPE = {
@@ -62,8 +72,26 @@ MORPHOLOGY_LABEL = {
     6:'Scd', 7:'Sd', 8:'Sdm', 9:'Sm', 10:'Im', 11:'BCD'
 }
 
+# Lookup tables for load_sparc. T is 0..11, so it is also the category
+# code of its label; unknown galaxies (T = -1) get the trailing 'Unknown'.
+_HTYPE_NAMES = np.array(sorted(HUBBLE_TYPE))
+_HTYPE_CODES = np.array([HUBBLE_TYPE[n] for n in _HTYPE_NAMES], dtype=np.int8)
+MORPH_DTYPE = pd.CategoricalDtype([MORPHOLOGY_LABEL[t] for t in range(12)] + ['Unknown'])
+
 
-def load_sparc(filepath):
+def lookup_hubble_type(names):
+    """
+    Hubble type T for an array of galaxy names, -1 where unknown.
+
+    Vectorised HUBBLE_TYPE lookup: one searchsorted over the sorted
+    name table instead of a dict lookup per name.
+    """
+    names = np.asarray(names, dtype=str)
+    idx = np.searchsorted(_HTYPE_NAMES, names).clip(max=len(_HTYPE_NAMES) - 1)
+    return np.where(_HTYPE_NAMES[idx] == names, _HTYPE_CODES[idx], np.int8(-1))
+
+
+def load_sparc(filepath, cache=True, dtype=np.float64):
     """
     Load SPARC mass model file into a DataFrame.
 
@@ -71,42 +99,148 @@ def load_sparc(filepath):
     ----------
     filepath : str or Path
         Path to MassModels_Lelli2016c.txt or equivalent.
+    cache : bool
+        If pyarrow is installed, reuse a sidecar .parquet of the parsed
+        file when it is at least as new as the text file, and write one
+        otherwise. Ignored without pyarrow or if the cache can't be written.
+    dtype : numpy dtype
+        Storage type of the numeric columns. np.float32 halves the frame's
+        memory (the values carry ~3 significant figures); the fitting and
+        benchmark code still computes in float64.
 
     Returns
     -------
     df : pd.DataFrame
         Columns: Galaxy, r, V_obs, eV, V_gas, V_disk, V_bul, SB_disk, SB_bul
         All velocities in km/s, r in kpc, SB in L_sun/pc^2.
+
+    Notes
+    -----
+    Parsed frames are also kept in memory, keyed by resolved path and
+    modification time, so repeated calls in one process only copy. Each
+    call returns its own copy, safe to modify.
     """
-    rows = []
-    with open(filepath) as f:
-        for line in f:
-            if line.startswith('#') or line.strip() == '':
-                continue
-            p = line.split()
-            if len(p) < 9:
-                continue
+    path = Path(filepath).resolve()
+    df = _load_sparc_cached(str(path), path.stat().st_mtime_ns, bool(cache), np.dtype(dtype))
+    return df.copy()   # copies attrs, so the galaxy index comes along
+
+
+@lru_cache(maxsize=4)
+def _load_sparc_cached(path, mtime_ns, cache, dtype):
+    """load_sparc body; mtime_ns is only part of the cache key."""
+    filepath = Path(path)
+    cache_path = filepath.with_suffix('.parquet')
+    if (cache and _HAVE_PARQUET and cache_path.exists()
+            and cache_path.stat().st_mtime >= filepath.stat().st_mtime):
+        df = pd.read_parquet(cache_path)
+    else:
+        df = _parse_sparc(filepath)
+        if cache and _HAVE_PARQUET:
             try:
-                rows.append({
-                    'Galaxy':   p[0],
-                    'r':        float(p[2]),
-                    'V_obs':    float(p[3]),
-                    'eV':       float(p[4]),
-                    'V_gas':    float(p[5]),
-                    'V_disk':   float(p[6]),
-                    'V_bul':    float(p[7]),
-                    'SB_disk':  float(p[8]),
-                    'SB_bul':   float(p[9]) if len(p) > 9 else 0.0,
-                })
-            except (ValueError, IndexError):
-                continue
-
-    df = pd.DataFrame(rows)
-    df['T']    = df['Galaxy'].map(HUBBLE_TYPE).fillna(-1).astype(int)
-    df['morph'] = df['T'].map(MORPHOLOGY_LABEL).fillna('Unknown')
+                df.to_parquet(cache_path, compression='zstd', index=False)
+            except (OSError, ValueError):
+                pass   # read-only data directory etc.: just skip the cache
+    if dtype != np.float64:
+        df = df.astype({c: dtype for c in _NUMERIC_COLUMNS})
+
+    # Look up each distinct name once, then broadcast by factorize codes
+    codes, names = pd.factorize(df['Galaxy'])
+    T = lookup_hubble_type(names)[codes]
+    df['T']    = T
+    df['morph'] = pd.Categorical.from_codes(np.where(T >= 0, T, 12), dtype=MORPH_DTYPE)
+    df.attrs['_gindex'] = _galaxy_index(codes, names)
     return df
 
 
+def _galaxy_index(codes, names):
+    """
+    Galaxy name -> row positions from pd.factorize output, as the tuple
+    (n_rows, names, starts, rows): galaxy names[g] is at positions
+    rows[starts[g]:starts[g+1]], with rows/starts stored as int64 bytes.
+
+    It lives in df.attrs, which pandas deep-copies into every derived
+    frame and compares with == in concat; immutable bytes and str make
+    both cheap and well defined (arrays in attrs would break concat).
+    """
+    rows = np.argsort(codes, kind='stable').astype(np.int64)
+    starts = np.searchsorted(codes[rows], np.arange(len(names) + 1)).astype(np.int64)
+    return len(codes), tuple(names), starts.tobytes(), rows.tobytes()
+
+
+def _indexed_positions(df, name):
+    """
+    Row positions of galaxy `name` from df's load_sparc index, or None if
+    the index doesn't describe `df`.
+
+    Derived frames inherit the index with attrs. Row-preserving ones
+    (copies, column selections, new columns) keep valid positions; a
+    filtered or reordered frame fails the length check or the check that
+    the indexed rows still hold `name`, and get_galaxy scans instead.
+    """
+    gindex = df.attrs.get('_gindex')
+    if not isinstance(gindex, tuple) or gindex[0] != len(df):
+        return None
+    n_rows, names, starts, rows = gindex
+    try:
+        g = names.index(name)
+    except ValueError:
+        return np.empty(0, dtype=np.intp)
+    lo, hi = np.frombuffer(starts, dtype=np.int64)[g:g + 2]
+    pos = np.frombuffer(rows, dtype=np.int64)[lo:hi]
+    return pos if (df['Galaxy'].to_numpy()[pos] == name).all() else None
+
+
+def _data_start(f):
+    """
+    Byte offset and field count of the first data row in binary file `f`:
+    the first line with at least the nine columns through SB_disk and a
+    numeric r.
+
+    Only the preamble (comments, blank lines, an MRT 'Title: ...' header)
+    is scanned line by line; read_csv takes over from there.
+    """
+    while True:
+        start = f.tell()
+        line = f.readline()
+        if not line:
+            return start, 0
+        p = line.split()
+        if line.startswith(b'#') or len(p) < len(SPARC_COLUMNS) - 1:
+            continue
+        try:
+            float(p[2])
+        except ValueError:
+            continue
+        return start, len(p)
+
+
+def _parse_sparc(filepath):
+    """Parse the SPARC text file (no T/morph columns); see load_sparc."""
+    # read_csv parses everything after the preamble. It takes the field
+    # count from the first row, so name at least that many columns;
+    # usecols then cuts later wide rows instead of skipping them. Short
+    # rows come back NaN-padded: a missing SB_bul means no bulge, any
+    # other missing or non-numeric field drops the row.
+    # Not pyarrow.csv / engine='pyarrow': SPARC files are column-aligned
+    # with runs of spaces, which Arrow's single-character delimiter reads
+    # as empty fields, and collapsing them first costs more than this
+    # parse. Repeat loads go through the Parquet cache instead.
+    keep = [SPARC_COLUMNS.index(c) for c in ['Galaxy'] + _NUMERIC_COLUMNS]
+    with open(filepath, 'rb') as f:
+        start, width = _data_start(f)
+        f.seek(start)
+        df = pd.read_csv(f, sep=r'\s+', header=None, comment='#',
+                         names=range(max(width, len(SPARC_COLUMNS))), usecols=keep,
+                         dtype={0: str}, engine='c', on_bad_lines='skip')
+    df.columns = ['Galaxy'] + _NUMERIC_COLUMNS
+    no_bulge = df['SB_bul'].isna()
+    for col in _NUMERIC_COLUMNS:
+        if df[col].dtype != np.float64:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(np.float64)
+    df.loc[no_bulge, 'SB_bul'] = 0.0
+    return df.dropna(subset=_NUMERIC_COLUMNS).reset_index(drop=True)
+
+
 def get_galaxy(df, name):
     """
     Extract valid rotation curve points for a single galaxy.
@@ -117,9 +251,64 @@ def get_galaxy(df, name):
     -------
     sub : pd.DataFrame, sorted by r.
     """
-    sub = df[df['Galaxy'] == name].copy()
-    sub = sub[(sub['V_obs'] > 1) & (sub['eV'] > 0) & (sub['r'] > 0)]
-    return sub.sort_values('r').reset_index(drop=True)
+    pos = _indexed_positions(df, name)
+    if pos is None:
+        pos = np.flatnonzero((df['Galaxy'] == name).to_numpy())
+    # Cut and sort on row positions, then take the rows once
+    r = df['r'].to_numpy()[pos]
+    keep = (df['V_obs'].to_numpy()[pos] > 1) & (df['eV'].to_numpy()[pos] > 0) & (r > 0)
+    pos = pos[keep][np.argsort(r[keep], kind='stable')]
+    return df.iloc[pos].reset_index(drop=True)
+
+
+# Columns galaxy_arrays stacks by default: what the fits need
+GALAXY_ARRAY_COLUMNS = ('r', 'V_obs', 'eV', 'V_gas', 'V_disk', 'V_bul')
+
+
+def galaxy_arrays(df, columns=GALAXY_ARRAY_COLUMNS):
+    """
+    Every galaxy's get_galaxy rows, stacked once into flat arrays.
+
+    Galaxies are in name order; galaxy g occupies rows
+    offsets[g]:offsets[g+1] of each column, with the same quality cuts
+    and r order as get_galaxy. Build it once and slice with
+    get_galaxy_arrays instead of calling get_galaxy per galaxy.
+
+    Returns
+    -------
+    arrays : dict
+        'names' (list of str), 'index' (name -> g), 'T' (int8 per galaxy),
+        'offsets' (int64, length G+1) and one contiguous float64 array
+        per name in `columns`.
+    """
+    r = df['r'].to_numpy()
+    keep = np.flatnonzero((df['V_obs'].to_numpy() > 1) & (df['eV'].to_numpy() > 0) & (r > 0))
+    codes, names = pd.factorize(df['Galaxy'].to_numpy()[keep], sort=True)
+    # Sort by galaxy, then r; lexsort is stable, like get_galaxy's argsort
+    rows = keep[np.lexsort((r[keep], codes))]
+    starts = np.searchsorted(np.sort(codes), np.arange(len(names) + 1))
+
+    arrays = {
+        'names':   list(names),
+        'index':   {name: g for g, name in enumerate(names)},
+        'T':       df['T'].to_numpy()[rows[starts[:-1]]].astype(np.int8),
+        'offsets': starts.astype(np.int64),
+    }
+    for c in columns:
+        arrays[c] = df[c].to_numpy(np.float64)[rows]
+    return arrays
+
+
+def get_galaxy_arrays(arrays, name, columns=GALAXY_ARRAY_COLUMNS):
+    """
+    One galaxy's columns from galaxy_arrays, as a tuple of views in
+    `columns` order (empty arrays for an unknown galaxy).
+    """
+    g = arrays['index'].get(name)
+    if g is None:
+        return tuple(arrays[c][:0] for c in columns)
+    lo, hi = arrays['offsets'][g], arrays['offsets'][g + 1]
+    return tuple(arrays[c][lo:hi] for c in columns)
 
 
 def galaxy_list(df):
@@ -136,13 +325,8 @@ def morphology_groups(df):
         'disk'   : T in [3, 4, 5, 6, 7]  Sb–Sd
         'irreg'  : T in [8, 9, 10, 11]  Sdm–Im–BCD
     """
-    groups = {'early': [], 'disk': [], 'irreg': []}
-    for gname in galaxy_list(df):
-        T = HUBBLE_TYPE.get(gname, -1)
-        if T <= 2:
-            groups['early'].append(gname)
-        elif T <= 7:
-            groups['disk'].append(gname)
-        else:
-            groups['irreg'].append(gname)
-    return groups
+    uniq = df[['Galaxy', 'T']].drop_duplicates('Galaxy').sort_values('Galaxy')
+    names = uniq['Galaxy'].to_numpy()
+    bins = np.digitize(uniq['T'].to_numpy(), [3, 8])   # unknown T = -1 -> early
+    return {label: names[bins == k].tolist()
+            for k, label in enumerate(('early', 'disk', 'irreg'))}
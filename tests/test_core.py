@@ -0,0 +1,213 @@
+"""
+Checks for the compiled kernels, the M/L fitter and the SPARC loader.
+
+Run from the repository root with `python -m pytest tests`.
+"""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from ..fitting import fit_ml, fit_ml_batch, fit_ml_single, _dv_dml, _mass_basis, _v_pred_from_v2
+from ..geometric_bridge import (A0, boost, predict_rotation_curve, predict_rotation_curve_batch,
+                                fit_metrics)
+from ..sparc_loader import (load_sparc, get_galaxy, galaxy_arrays, get_galaxy_arrays,
+                            GALAXY_ARRAY_COLUMNS)
+
+
+# NGC0289-like curve: signed-negative V_gas drives V_bar^2 <= 0 at some radii
+# for low M/L_disk, and the chi^2 optimum lies just past that kink.
+KINK_GALAXY = {
+    'r':      [1.07, 1.26, 2.44, 4.5, 4.7, 5.15, 6.74, 10.97, 14.11, 16.66,
+               17.36, 19.22, 19.37, 19.62, 24.05],
+    'V_obs':  [87.03, 87.22, 70.15, 58.42, 61.39, 68.36, 71.09, 76.47, 46.91,
+               85.96, 86.43, 85.27, 88.04, 17.6, 86.86],
+    'eV':     [2.37, 1.43, 1.36, 4.07, 3.57, 0.91, 1.82, 2.86, 2.5, 2.95, 2.95,
+               3.38, 1.4, 2.9, 3.29],
+    'V_gas':  [4.41, 5.14, 9.44, -14.94, -15.33, 16.14, 18.22, 20.35, -20.71,
+               20.81, 20.82, 20.84, 20.84, -20.84, 20.86],
+    'V_disk': [32.66, 34.17, 39.59, 42.2, 42.27, 42.35, 42.12, 39.68, 37.33,
+               35.36, 34.83, 33.41, 33.3, 33.11, 29.89],
+    'V_bul':  [84.48, 77.07, 42.66, 15.23, 13.79, 11.01, 4.96, 0.6, 0.12, 0.03,
+               0.02, 0.01, 0.01, 0.01, 0.0],
+}
+
+
+def _reference_v_pred(r, v_gas, v_disk, v_bul, ml_disk, ml_bul, a0=A0):
+    """Plain NumPy geometric bridge: signed gas term, V_bar^2 and g_bar floors."""
+    v2 = np.sign(v_gas) * v_gas**2 + ml_disk * v_disk**2 + ml_bul * v_bul**2
+    g_bar = np.maximum(np.maximum(v2, 0.0) / np.maximum(r, 1e-6), 1e-20)
+    return np.sqrt(np.sqrt(g_bar**2 + a0 * g_bar) * r)
+
+
+def _galaxy_args(gal):
+    return [np.array(gal[c]) for c in ('r', 'V_obs', 'eV', 'V_gas', 'V_disk', 'V_bul')]
+
+
+def _grid_chi2(args, ml_pairs):
+    r, v_obs, ev, v_gas, v_disk, v_bul = args
+    v_pred = predict_rotation_curve_batch(r, v_gas, v_disk, v_bul, ml_pairs)
+    return np.sum(((v_obs - v_pred) / np.maximum(ev, 0.5))**2, axis=1)
+
+
+def test_fit_ml_past_gas_kink():
+    args = _galaxy_args(KINK_GALAXY)
+    grid = np.array(np.meshgrid(np.linspace(0.05, 6.0, 120),
+                                np.linspace(0.05, 8.0, 80))).reshape(2, -1).T
+    best = _grid_chi2(args, grid).min()
+    fit = fit_ml(*args)
+    assert fit['chi2'] <= best * 1.001
+    chi2_at_fit = _grid_chi2(args, np.array([[fit['ml_disk'], fit['ml_bul']]]))[0]
+    assert np.isclose(fit['chi2'], chi2_at_fit)
+
+
+def test_fit_ml_single_past_gas_kink():
+    args = _galaxy_args(KINK_GALAXY)
+    ml = np.linspace(0.05, 6.0, 600)
+    best = _grid_chi2(args, np.column_stack([ml, ml])).min()
+    assert fit_ml_single(*args)['chi2'] <= best * 1.001
+
+
+def test_fit_metrics_matches_numpy():
+    rng = np.random.default_rng(1)
+    v_obs = rng.uniform(20.0, 200.0, 40)
+    v_pred = v_obs + rng.normal(0.0, 5.0, 40)
+    rms, r2 = fit_metrics(v_obs, v_pred)
+    ss_res = np.sum((v_obs - v_pred)**2)
+    assert np.isclose(rms, np.sqrt(np.mean((v_obs - v_pred)**2)))
+    assert np.isclose(r2, 1 - ss_res / np.sum((v_obs - v_obs.mean())**2))
+
+
+def test_fit_metrics_degenerate_input():
+    assert np.isnan(fit_metrics(np.full(3, 50.0), np.full(3, 49.0))[1])
+    assert all(np.isnan(fit_metrics(np.empty(0), np.empty(0))))
+
+
+def test_predict_batch_matches_numpy():
+    r, _, _, v_gas, v_disk, v_bul = _galaxy_args(KINK_GALAXY)
+    ml_pairs = np.array([[0.05, 0.05], [0.3, 0.9], [0.5, 0.7], [5.5, 8.0]])
+    v_pred = predict_rotation_curve_batch(r, v_gas, v_disk, v_bul, ml_pairs)
+    assert v_pred.shape == (len(ml_pairs), len(r))
+    for row, (ml_d, ml_b) in zip(v_pred, ml_pairs):
+        np.testing.assert_allclose(
+            row, _reference_v_pred(r, v_gas, v_disk, v_bul, ml_d, ml_b), rtol=1e-12)
+
+
+def test_v_pred_from_basis_matches_numpy():
+    r, _, _, v_gas, v_disk, v_bul = _galaxy_args(KINK_GALAXY)
+    basis = _mass_basis(v_gas, v_disk, v_bul)
+    assert basis.flags.f_contiguous
+    expected = _reference_v_pred(r, v_gas, v_disk, v_bul, 0.3, 0.9)
+    v2 = basis @ np.array([1.0, 0.3, 0.9])
+    np.testing.assert_allclose(_v_pred_from_v2(r, v2), expected, rtol=1e-12)
+    np.testing.assert_allclose(_v_pred_from_v2(r, v2, out=v2), expected, rtol=1e-12)
+
+
+def test_dv_dml_matches_finite_differences():
+    r, _, _, v_gas, v_disk, v_bul = _galaxy_args(KINK_GALAXY)
+    ml_d, ml_b, h = 0.8, 1.1, 1e-6
+    basis = _mass_basis(v_gas, v_disk, v_bul)
+    assert np.all(basis @ np.array([1.0, ml_d, ml_b]) > 0)
+
+    def v_at(md, mb):
+        return predict_rotation_curve(r, v_gas, v_disk, v_bul, md, mb)
+
+    fd = np.column_stack([(v_at(ml_d + h, ml_b) - v_at(ml_d - h, ml_b)) / (2 * h),
+                          (v_at(ml_d, ml_b + h) - v_at(ml_d, ml_b - h)) / (2 * h)])
+    np.testing.assert_allclose(_dv_dml(r, basis, ml_d, ml_b), fd, rtol=1e-5, atol=1e-6)
+
+
+def test_boost_floors_g_bar_where_v_bar_vanishes():
+    r = np.array([0.5, 1.0, 2.0])
+    v_gas = np.array([-10.0, 0.0, 20.0])
+    zeros = np.zeros_like(r)
+    b = boost(r, v_gas, zeros, zeros)
+    floor = np.sqrt(np.sqrt(1e-40 + A0 * 1e-20) / 1e-20)
+    np.testing.assert_allclose(b[:2], floor)
+    g_bar = 400.0 / 2.0
+    np.testing.assert_allclose(b[2], np.sqrt(np.sqrt(g_bar**2 + A0 * g_bar) / g_bar))
+
+
+SPARC_TEXT = """\
+Title: SPARC. I. Mass Models for 175 Disk Galaxies with Spitzer Photometry
+Authors: Lelli F., McGaugh S.S., Schombert J.M.
+================================================================================
+   1- 11  A11     ---     ID      Galaxy identifier
+# comment line
+NGC0024      7.30    0.50   37.54   9.10   8.35   30.07    0.00   147.32   0.00
+NGC0024      7.30    1.00   48.81   4.60  14.16   44.20    0.00   142.69
+NGC0024      7.30    1.50   58.05   4.00   bad    52.39    0.00    90.53   0.00
+NGC0024      7.30    2.00   67.06   2.60  20.60   55.80    0.00    49.64   0.00   extra
+NGC0024      7.30    2.50
+"""
+
+
+def test_load_sparc_skips_preamble_and_keeps_short_rows(tmp_path):
+    path = tmp_path / 'MassModels.txt'
+    path.write_text(SPARC_TEXT)
+    df = load_sparc(path, cache=False)
+    np.testing.assert_array_equal(df['r'], [0.5, 1.0, 2.0])
+    np.testing.assert_array_equal(df['SB_bul'], [0.0, 0.0, 0.0])
+    np.testing.assert_array_equal(df['SB_disk'], [147.32, 142.69, 49.64])
+    assert (df['Galaxy'] == 'NGC0024').all() and (df['T'] == 5).all()
+
+
+def test_get_galaxy_unknown_name_is_empty(tmp_path):
+    path = tmp_path / 'MassModels.txt'
+    path.write_text(SPARC_TEXT)
+    df = load_sparc(path, cache=False)
+    sub = get_galaxy(df, 'NGC9999')
+    assert len(sub) == 0 and list(sub.columns) == list(df.columns)
+    assert len(get_galaxy(df, 'NGC0024')) == 3
+
+
+def test_get_galaxy_on_derived_frames(tmp_path):
+    path = tmp_path / 'MassModels.txt'
+    path.write_text(SPARC_TEXT + SPARC_TEXT.replace('NGC0024', 'NGC0055'))
+    df = load_sparc(path, cache=False)
+    expected = get_galaxy(df, 'NGC0055')
+    assert len(expected) == 3 and (expected['Galaxy'] == 'NGC0055').all()
+    # attrs (and the galaxy index) follow every derived frame
+    for derived in (df.iloc[::-1], df.sort_values('r'), df[df['r'] > 0.5],
+                    pd.concat([df, df]).drop_duplicates(), pickle.loads(pickle.dumps(df))):
+        sub = get_galaxy(derived, 'NGC0055')
+        pd.testing.assert_frame_equal(sub, expected[expected['r'].isin(sub['r'])]
+                                      .reset_index(drop=True))
+    assert len(get_galaxy(df[df['r'] > 0.5], 'NGC0055')) == 2
+
+
+def test_galaxy_arrays_match_get_galaxy(tmp_path):
+    path = tmp_path / 'MassModels.txt'
+    path.write_text(SPARC_TEXT.replace('NGC0024', 'NGC0055')
+                    + SPARC_TEXT.replace('0.50   37.54', '3.50   37.54'))
+    df = load_sparc(path, cache=False)
+    arrays = galaxy_arrays(df)
+    assert arrays['names'] == ['NGC0024', 'NGC0055']
+    offsets = arrays['offsets']
+    assert offsets[0] == 0 and offsets[-1] == len(arrays['r'])
+    for g, name in enumerate(arrays['names']):
+        sub = get_galaxy(df, name)
+        assert offsets[g + 1] - offsets[g] == len(sub)
+        assert arrays['T'][g] == sub['T'].iloc[0]
+        for c, col in zip(GALAXY_ARRAY_COLUMNS, get_galaxy_arrays(arrays, name)):
+            np.testing.assert_array_equal(col, sub[c].to_numpy(np.float64))
+            np.testing.assert_array_equal(arrays[c][offsets[g]:offsets[g + 1]], col)
+    assert all(len(col) == 0 for col in get_galaxy_arrays(arrays, 'NGC9999'))
+
+
+def test_fit_ml_batch_matches_fit_ml():
+    r, v_obs, ev, v_gas, v_disk, v_bul = _galaxy_args(KINK_GALAXY)
+    galaxies = [(r, v_obs, ev, v_gas, v_disk, v_bul),
+                (r, v_obs, ev, np.abs(v_gas), 1.3 * v_disk, np.zeros_like(r))]
+    arrays = {c: np.concatenate([gal[k] for gal in galaxies])
+              for k, c in enumerate(('r', 'V_obs', 'eV', 'V_gas', 'V_disk', 'V_bul'))}
+    arrays['offsets'] = np.array([0, len(r), 2 * len(r)])
+    batch = fit_ml_batch(arrays)
+    for g, gal in enumerate(galaxies):
+        fit = fit_ml(*gal)
+        assert batch['chi2'][g] <= fit['chi2'] * (1 + 1e-6)
+        v_pred = predict_rotation_curve(gal[0], *gal[3:], batch['ml_disk'][g], batch['ml_bul'][g])
+        np.testing.assert_allclose((batch['rms'][g], batch['r2'][g]),
+                                   fit_metrics(gal[1], v_pred), rtol=1e-9)
+    assert batch['ml_bul'][1] == 0.7   # no bulge: M/L_bul keeps its init value